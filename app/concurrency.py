@@ -0,0 +1,109 @@
+"""Bounded concurrent fan-out for blocking upstream calls.
+
+This module is self-contained: it depends only on the standard library,
+so it can be reused by any module that needs to run many slow I/O
+calls (yfinance scrapes, HTTP requests) side by side.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Hashable, Iterable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Defaults for the per-ETF fan-outs (holdings, sectors).
+FETCH_MAX_WORKERS = 8
+FETCH_TIMEOUT_SECONDS = 20.0  # per ETF
+
+_POLL_SECONDS = 0.05
+
+
+def map_bounded(
+    fn: Callable[[K], V],
+    items: Iterable[K],
+    max_workers: int = 8,
+    timeout: float | Callable[[K], float] | None = None,
+    deadline: float | None = None,
+) -> tuple[dict[K, V], dict[K, str]]:
+    """Call *fn* on every item concurrently with at most *max_workers* threads.
+
+    *timeout* bounds each call, measured from when it actually starts
+    running (pass a function of the item for per-item timeouts);
+    *deadline* (a ``time.monotonic()`` value) bounds the whole batch.
+    Calls still running past either limit are abandoned: their worker
+    thread finishes in the background and the result is dropped.
+
+    Returns ``(results, errors)``: successful results keyed by item, and
+    an error message for every item that raised or timed out. Duplicate
+    items are only called once.
+    """
+    unique = list(dict.fromkeys(items))
+    results: dict[K, V] = {}
+    errors: dict[K, str] = {}
+    if not unique:
+        return results, errors
+
+    started: dict[K, float] = {}
+
+    def timeout_for(item: K) -> float | None:
+        return timeout(item) if callable(timeout) else timeout
+
+    def run(item: K) -> V:
+        started[item] = time.monotonic()
+        return fn(item)
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(unique)))
+    futures = {pool.submit(run, item): item for item in unique}
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            limits = [deadline] if deadline is not None else []
+            for future in pending:
+                item = futures[future]
+                item_timeout = timeout_for(item)
+                if item_timeout is None:
+                    continue
+                if item in started:
+                    limits.append(started[item] + item_timeout)
+                else:
+                    # Queued call: re-check soon to pick up its start time.
+                    limits.append(now + _POLL_SECONDS)
+            wait_for = max(0.0, min(limits) - now) if limits else None
+
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = futures[future]
+                try:
+                    results[item] = future.result()
+                except Exception as e:
+                    errors[item] = str(e) or type(e).__name__
+
+            now = time.monotonic()
+            for future in list(pending):
+                item = futures[future]
+                item_timeout = timeout_for(item)
+                if deadline is not None and now >= deadline:
+                    errors[item] = "deadline exceeded"
+                elif (
+                    item_timeout is not None
+                    and item in started
+                    and now - started[item] >= item_timeout
+                ):
+                    errors[item] = f"timed out after {item_timeout:g}s"
+                else:
+                    continue
+                future.cancel()
+                pending.discard(future)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return results, errors
@@ -12,3 +12,19 @@ FRED_API_KEY = os.getenv("FRED_API_KEY", "")
 MACRO_CONFIG_PATH = os.getenv("MACRO_CONFIG_PATH", "macro_config.yaml")
 LYN_ALDEN_DIR = os.getenv("LYN_ALDEN_DIR", "context/macro/Lyn Alden")
 SELL_SIDE_DIR = os.getenv("SELL_SIDE_DIR", "context/macro/sell-side")
+QUOTE_CACHE_TTL_SECONDS = float(os.getenv("QUOTE_CACHE_TTL_SECONDS", "60"))
+QUOTE_CACHE_MAX_SIZE = int(os.getenv("QUOTE_CACHE_MAX_SIZE", "512"))
+DATA_DIR = os.getenv("DATA_DIR", "data")
+FUND_CACHE_TTL_SECONDS = float(os.getenv("FUND_CACHE_TTL_SECONDS", str(24 * 3600)))
+CONFIG_WATCH_SECONDS = float(os.getenv("CONFIG_WATCH_SECONDS", "0"))
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+SCHEDULER_MACRO_SECONDS = float(os.getenv("SCHEDULER_MACRO_SECONDS", "600"))
+SCHEDULER_NEWS_SECONDS = float(os.getenv("SCHEDULER_NEWS_SECONDS", "1500"))
+SCHEDULER_QUOTES_SECONDS = float(os.getenv("SCHEDULER_QUOTES_SECONDS", "45"))
+SCHEDULER_FUNDS_SECONDS = float(os.getenv("SCHEDULER_FUNDS_SECONDS", "3600"))
+SCHEDULER_NAV_SECONDS = float(os.getenv("SCHEDULER_NAV_SECONDS", "900"))
+RISK_BENCHMARK = os.getenv("RISK_BENCHMARK", "IWDA.AS")
+RISK_BENCHMARK_CURRENCY = os.getenv("RISK_BENCHMARK_CURRENCY", "EUR")
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", "0.02"))
+RISK_LOOKBACK_YEARS = float(os.getenv("RISK_LOOKBACK_YEARS", "5"))
@@ -0,0 +1,135 @@
+"""Parse-once registry of the YAML configuration files.
+
+This module is self-contained: it depends only on PyYAML and the
+standard library, so it can be reused by any module that reads
+portfolio.yaml, transactions.yaml, target_portfolio.yaml or
+macro_config.yaml.
+
+Each file is parsed once and its content handed out as an immutable
+object (dicts become read-only ``FrozenDict``, lists become tuples), so
+every caller can share the same instance. A read costs one ``os.stat``:
+the file is re-read only when its mtime or size changes, and re-parsed
+only when its content hash changes too. An optional polling watcher
+re-parses edited files in the background so that even the first read
+after an edit finds them ready.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import yaml
+
+
+# ---------------------------------------------------------------------------
+# Immutable values
+# ---------------------------------------------------------------------------
+
+class FrozenDict(dict):
+    """Read-only dict: any mutation raises TypeError.
+
+    Still a ``dict`` subclass, so JSON encoding, ``dict(...)`` copies and
+    pickling keep working.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("configuration values are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples."""
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Entry:
+    stat_key: tuple[int, int]  # (mtime_ns, size)
+    digest: str
+    value: Any
+
+
+_entries: dict[str, _Entry] = {}
+_lock = threading.Lock()
+
+_watcher: threading.Thread | None = None
+
+
+def load_yaml(path: str, default: Any = None) -> Any:
+    """Return the frozen content of the YAML file at *path*.
+
+    Returns *default* when the file does not exist. Parse errors
+    propagate and are not cached (the next read tries again).
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _entries.pop(path, None)
+        return default
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+
+    entry = _entries.get(path)
+    if entry is not None and entry.stat_key == stat_key:
+        return entry.value
+
+    with _lock:
+        entry = _entries.get(path)
+        if entry is not None and entry.stat_key == stat_key:
+            return entry.value
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if entry is not None and entry.digest == digest:
+            value = entry.value  # touched but unchanged: keep the parsed copy
+        else:
+            value = freeze(yaml.safe_load(raw))
+        _entries[path] = _Entry(stat_key, digest, value)
+        return value
+
+
+def file_digest(path: str) -> str | None:
+    """Content hash of a file last read through :func:`load_yaml`."""
+    entry = _entries.get(path)
+    return entry.digest if entry is not None else None
+
+
+def start_watching(interval_seconds: float) -> None:
+    """Poll every loaded file each *interval_seconds* and re-parse edits.
+
+    Polling (one ``os.stat`` per file) rather than inotify keeps this
+    portable and dependency-free. Calling it again is a no-op.
+    """
+    global _watcher
+    if _watcher is not None or interval_seconds <= 0:
+        return
+
+    def run() -> None:
+        while True:
+            time.sleep(interval_seconds)
+            for path in list(_entries):
+                try:
+                    load_yaml(path)
+                except Exception:
+                    pass  # keep the last good copy; the next read will raise
+
+    _watcher = threading.Thread(target=run, name="config-watcher", daemon=True)
+    _watcher.start()
@@ -0,0 +1,307 @@
+"""Incrementally updated EWMA covariance of the portfolio's tickers.
+
+This module is self-contained: it depends only on numpy, the standard
+library, the base currency (``app.config``), ``app.performance`` (for
+the historical EUR prices) and the price store's refresh interval. None
+of them needs a database, so it can be reused by any script that needs
+correlations between tickers.
+
+The daily covariance of EUR returns follows the RiskMetrics
+exponentially weighted recursion::
+
+    cov_t = decay * cov_(t-1) + (1 - decay) * r_t r_t^T
+
+It is built once from the warm-up history with a single weighted
+matrix product. After that, each newly closed day costs one rank-1
+update, not a full recompute. Today's provisional close is applied to a
+copy only, so it is never folded into the state twice. The tracked
+universe only grows: requesting a ticker that is not tracked yet
+triggers one full rebuild. A missing return (a ticker not listed yet,
+or a gap) counts as zero. A ticker with no close at all in the warm-up
+window (e.g. a failed download) is reported as unknown instead, and
+requesting it triggers a rebuild, so the download is retried, at most
+every ``TAIL_REFRESH_SECONDS`` per ticker.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.config import BASE_CURRENCY
+from app.performance import NAV_LOOKBACK_DAYS, eur_price_matrix
+from app.price_store import TAIL_REFRESH_SECONDS
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+EWMA_DECAY = 0.94  # RiskMetrics daily decay (half-life of about 11 days)
+WARMUP_DAYS = 400  # calendar days of history for the first build (decay^250 ~ 2e-7)
+TRADING_DAYS_PER_YEAR = 252
+TOP_PAIRS = 10
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _State:
+    currencies: dict[str, str]  # ticker -> quote currency, in row order
+    cov: np.ndarray  # daily covariance through last_date (closed days only)
+    last_date: datetime.date | None
+    last_prices: np.ndarray  # EUR closes on last_date (NaN if unknown)
+    provisional: np.ndarray | None  # today's return so far, if today traded
+    as_of: datetime.date  # day of the last build / update
+    checked_at: float  # monotonic time of the last build / update
+    missing: np.ndarray  # per ticker: no close in the warm-up window
+    updates: int = 0  # rank-1 updates since the last full build
+
+
+@dataclass
+class CorrelationResult:
+    """Correlations and annualized volatilities of held and target tickers."""
+
+    as_of: str = ""
+    decay: float = EWMA_DECAY
+    tickers: list[str] = field(default_factory=list)
+    volatility_pct: dict[str, float | None] = field(default_factory=dict)
+    correlation: list[list[float | None]] = field(default_factory=list)
+    most_correlated: list[dict] = field(default_factory=list)
+    portfolio_volatility_pct: float | None = None
+    target_volatility_pct: float | None = None
+    incremental_updates: int = 0
+
+
+_lock = threading.Lock()
+_state: _State | None = None
+_missing_since: dict[str, float] = {}  # ticker -> monotonic time of its last failed build
+
+
+# ---------------------------------------------------------------------------
+# State maintenance
+# ---------------------------------------------------------------------------
+
+def _returns(prices: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Return from *previous* to *prices* per ticker (0 where unknown)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.nan_to_num(prices / previous - 1.0, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _provisional(
+    dates: list[datetime.date], prices: np.ndarray, last_prices: np.ndarray, today: datetime.date,
+) -> np.ndarray | None:
+    if dates and dates[-1] == today:
+        return _returns(prices[:, -1], last_prices)
+    return None
+
+
+def _build(currencies: dict[str, str], today: datetime.date) -> _State:
+    """Full computation over the warm-up history (one matrix product)."""
+    start = today - datetime.timedelta(days=WARMUP_DAYS)
+    dates, prices = eur_price_matrix(currencies, start, today)
+    n = len(currencies)
+    closed = [i for i, d in enumerate(dates) if d < today]
+    if not closed:
+        return _State(
+            currencies=dict(currencies), cov=np.zeros((n, n)), last_date=None,
+            last_prices=np.full(n, np.nan), provisional=None,
+            as_of=today, checked_at=time.monotonic(), missing=np.ones(n, dtype=bool),
+        )
+
+    closed_prices = prices[:, closed]
+    returns = _returns(closed_prices[:, 1:], closed_prices[:, :-1])
+    # Weight of day t in the recursion started from zero: (1 - decay) * decay^(T - t).
+    ages = np.arange(returns.shape[1] - 1, -1, -1)
+    weights = (1.0 - EWMA_DECAY) * EWMA_DECAY ** ages
+    cov = (returns * weights) @ returns.T
+
+    last_prices = closed_prices[:, -1]
+    return _State(
+        currencies=dict(currencies),
+        cov=cov,
+        last_date=dates[closed[-1]],
+        last_prices=last_prices,
+        provisional=_provisional(dates, prices, last_prices, today),
+        as_of=today,
+        checked_at=time.monotonic(),
+        missing=np.isnan(closed_prices).all(axis=1),
+    )
+
+
+def _advance(state: _State, today: datetime.date) -> _State:
+    """Fold the days closed since *state* was built in, one rank-1 update each."""
+    if state.last_date is None:
+        return _build(state.currencies, today)
+    start = state.last_date - datetime.timedelta(days=NAV_LOOKBACK_DAYS)
+    dates, prices = eur_price_matrix(state.currencies, start, today)
+    if state.last_date not in dates:
+        return _build(state.currencies, today)
+
+    j = dates.index(state.last_date)
+    previous = np.where(np.isnan(prices[:, j]), state.last_prices, prices[:, j])
+    cov = state.cov
+    updates = state.updates
+    last_date = state.last_date
+    for i in range(j + 1, len(dates)):
+        if dates[i] >= today:
+            break
+        r = _returns(prices[:, i], previous)
+        cov = EWMA_DECAY * cov + (1.0 - EWMA_DECAY) * np.outer(r, r)
+        previous = np.where(np.isnan(prices[:, i]), previous, prices[:, i])
+        last_date = dates[i]
+        updates += 1
+
+    return _State(
+        currencies=state.currencies,
+        cov=cov,
+        last_date=last_date,
+        last_prices=previous,
+        provisional=_provisional(dates, prices, previous, today),
+        as_of=today,
+        checked_at=time.monotonic(),
+        missing=state.missing,
+        updates=updates,
+    )
+
+
+def _needs_build(state: _State | None, currencies: dict[str, str]) -> bool:
+    """Whether a ticker of *currencies* is not tracked, or is due a retry of its history."""
+    if state is None:
+        return True
+    rows = {ticker: i for i, ticker in enumerate(state.currencies)}
+    now = time.monotonic()
+    return any(
+        t not in rows
+        or (
+            state.missing[rows[t]]
+            and now - _missing_since.get(t, 0.0) >= TAIL_REFRESH_SECONDS
+        )
+        for t in currencies
+    )
+
+
+def _current(currencies: dict[str, str]) -> _State:
+    """State covering *currencies*, brought up to date."""
+    global _state
+    today = datetime.date.today()
+    with _lock:
+        state = _state
+        if _needs_build(state, currencies):
+            universe = {**(state.currencies if state else {}), **currencies}
+            state = _build(universe, today)
+            for ticker, missing in zip(state.currencies, state.missing):
+                if missing:
+                    _missing_since[ticker] = state.checked_at
+                else:
+                    _missing_since.pop(ticker, None)
+        elif state.as_of != today or time.monotonic() - state.checked_at >= TAIL_REFRESH_SECONDS:
+            state = _advance(state, today)
+        _state = state
+        return state
+
+
+def _snapshot(currencies: dict[str, str]) -> tuple[_State, np.ndarray, np.ndarray]:
+    """(state, annualized covariance, last EUR prices) for *currencies*, in order."""
+    state = _current(currencies)
+    cov = state.cov
+    if state.provisional is not None:
+        r = state.provisional
+        cov = EWMA_DECAY * cov + (1.0 - EWMA_DECAY) * np.outer(r, r)
+    # Tickers without history are unknown, not zero-variance.
+    cov = np.where(state.missing[:, None] | state.missing[None, :], np.nan, cov)
+    rows = list(state.currencies)
+    index = [rows.index(t) for t in currencies]
+    return state, cov[np.ix_(index, index)] * TRADING_DAYS_PER_YEAR, state.last_prices[index]
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def covariance_matrix(currencies: dict[str, str]) -> np.ndarray:
+    """Annualized covariance of the tickers of *currencies* (in order).
+
+    *currencies* maps each ticker to its quote currency. Today's
+    provisional close is included. Rows and columns of tickers without
+    any history are NaN.
+    """
+    return _snapshot(currencies)[1]
+
+
+def portfolio_volatility(cov: np.ndarray, weights: np.ndarray) -> float | None:
+    """Annualized volatility of a portfolio with *weights* (normalized here)."""
+    total = weights.sum()
+    if total <= 0:
+        return None
+    w = weights / total
+    return math.sqrt(max(float(w @ cov @ w), 0.0))
+
+
+def _pct(value: float) -> float | None:
+    return round(value * 100, 2) if value is not None and math.isfinite(value) else None
+
+
+def compute_correlations(
+    positions: list[dict],
+    targets: list[tuple[str, float, str | None]],
+) -> CorrelationResult:
+    """Correlations between held and target tickers, and both portfolios' volatility.
+
+    *targets* are ``(ticker, weight_pct, currency or None)``. A target
+    ticker that is not held and has no currency is assumed to be quoted
+    in the base currency. The held portfolio is weighted by current EUR
+    value (quantity times last close).
+    """
+    currencies: dict[str, str] = {}
+    quantities: dict[str, float] = {}
+    for pos in positions:
+        currencies.setdefault(pos["ticker"], pos.get("currency") or BASE_CURRENCY)
+        quantities[pos["ticker"]] = quantities.get(pos["ticker"], 0.0) + float(pos["qty"])
+    for ticker, _, currency in targets:
+        currencies.setdefault(ticker, currency or BASE_CURRENCY)
+    if not currencies:
+        return CorrelationResult()
+
+    state, cov, last_prices = _snapshot(currencies)
+    tickers = list(currencies)
+    vol = np.sqrt(np.maximum(np.diag(cov), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(vol, vol)
+
+    held = np.array([quantities.get(t, 0.0) for t in tickers]) * np.nan_to_num(last_prices)
+    target_pct = dict((t, w) for t, w, _ in targets)
+    target = np.array([target_pct.get(t, 0.0) for t in tickers])
+
+    upper = np.triu_indices(len(tickers), k=1)
+    pairs = sorted(
+        (
+            (float(corr[i, j]), tickers[i], tickers[j])
+            for i, j in zip(*upper)
+            if math.isfinite(corr[i, j])
+        ),
+        reverse=True,
+    )[:TOP_PAIRS]
+
+    return CorrelationResult(
+        as_of=(
+            state.as_of if state.provisional is not None or state.last_date is None
+            else state.last_date
+        ).isoformat(),
+        tickers=tickers,
+        volatility_pct={t: _pct(float(v)) for t, v in zip(tickers, vol)},
+        correlation=[
+            [round(float(c), 4) if math.isfinite(c) else None for c in row] for row in corr
+        ],
+        most_correlated=[{"pair": [a, b], "correlation": round(c, 4)} for c, a, b in pairs],
+        portfolio_volatility_pct=_pct(portfolio_volatility(cov, held)),
+        target_volatility_pct=_pct(portfolio_volatility(cov, target)),
+        incremental_updates=state.updates,
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, func, inspect, select
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import DATABASE_URL
@@ -12,8 +12,29 @@ class Base(DeclarativeBase):
 
 
 def init_db():
-    from app.models import Position  # noqa: F401
+    from app.models import Position, DailyNav, DailyNavContribution, NavLot  # noqa: F401
     Base.metadata.create_all(bind=engine)
+    # create_all() skips existing tables: add indexes introduced since.
+    existing = {index["name"] for index in inspect(engine).get_indexes(Position.__tablename__)}
+    for index in Position.__table__.indexes:
+        if index.name in existing:
+            continue
+        if index.unique:
+            _drop_duplicates(Position, [column.name for column in index.columns])
+        index.create(bind=engine)
+
+
+def _drop_duplicates(model, columns: list[str]) -> None:
+    """Keep only the newest row (highest id) of each *columns* key.
+
+    Tables created before a unique index was introduced may hold
+    duplicates that would make its creation fail. Positions are a
+    snapshot rewritten by every save, so the older copies can go.
+    """
+    keys = [getattr(model, c) for c in columns]
+    newest = select(func.max(model.id)).group_by(*keys).scalar_subquery()
+    with engine.begin() as conn:
+        conn.execute(delete(model).where(model.id.not_in(newest)))
 
 
 def get_db():
@@ -0,0 +1,186 @@
+"""Persistent cache of ETF fund composition (holdings, sector weights).
+
+This module is self-contained: it depends only on the standard library
+(sqlite3, json, threading), so it can be reused by any script that
+needs cached fund data.
+
+Fund compositions change at most monthly, so scrapes are stored per
+(ticker, kind) in a SQLite file under the data directory with their
+fetch timestamp. Reads follow stale-while-revalidate: a fresh entry is
+returned directly, a stale one is returned immediately while a single
+background thread re-scrapes it, and only a missing entry blocks on
+the upstream fetch. A failed scrape is stored too (payload ``null``),
+so tickers without fund data (single stocks, ETFs Yahoo does not
+cover) are not re-scraped on every read: it is retried after
+``FAILURE_TTL_SECONDS``, in the background.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Callable
+
+from app.config import DATA_DIR, FUND_CACHE_TTL_SECONDS
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+FUND_CACHE_PATH = os.path.join(DATA_DIR, "funds.sqlite")
+FAILURE_TTL_SECONDS = 3600  # 1 hour before a failed scrape is retried
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fund_data (
+    ticker     TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (ticker, kind)
+) WITHOUT ROWID;
+"""
+
+# Scrapes one kind of fund data for a ticker. Must return a
+# JSON-serializable value other than None, and raise on failure
+# (failures are cached for FAILURE_TTL_SECONDS only).
+Fetcher = Callable[[str], Any]
+
+_init_lock = threading.Lock()
+_initialized_paths: set[str] = set()
+
+_inflight_lock = threading.Lock()
+_inflight: set[tuple[str, str, str]] = set()
+_miss_locks: dict[tuple[str, str, str], threading.Lock] = {}
+
+
+# ---------------------------------------------------------------------------
+# Storage helpers
+# ---------------------------------------------------------------------------
+
+def _connect(path: str) -> sqlite3.Connection:
+    if path not in _initialized_paths:
+        with _init_lock:
+            if path not in _initialized_paths:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with closing(sqlite3.connect(path)) as conn:
+                    conn.executescript(_SCHEMA)
+                _initialized_paths.add(path)
+    return sqlite3.connect(path, timeout=30)
+
+
+def _read(path: str, ticker: str, kind: str) -> tuple[Any, float] | None:
+    with closing(_connect(path)) as conn:
+        row = conn.execute(
+            "SELECT payload, fetched_at FROM fund_data WHERE ticker = ? AND kind = ?",
+            (ticker, kind),
+        ).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1]
+
+
+def _write(path: str, ticker: str, kind: str, value: Any) -> None:
+    with closing(_connect(path)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO fund_data (ticker, kind, payload, fetched_at) "
+            "VALUES (?, ?, ?, ?)",
+            (ticker, kind, json.dumps(value, default=str), time.time()),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def refresh_fund_data(
+    ticker: str,
+    kind: str,
+    fetch: Fetcher,
+    path: str = FUND_CACHE_PATH,
+) -> Any:
+    """Scrape *kind* data for *ticker* now and store it.
+
+    Raises on failure, after recording it, unless earlier data is
+    stored (which is then kept and served).
+    """
+    try:
+        value = fetch(ticker)
+    except Exception:
+        entry = _read(path, ticker, kind)
+        if entry is None or entry[0] is None:
+            _write(path, ticker, kind, None)
+        raise
+    _write(path, ticker, kind, value)
+    return value
+
+
+def fetched_at(ticker: str, kind: str, path: str = FUND_CACHE_PATH) -> float | None:
+    """Epoch time *kind* data for *ticker* was stored (or last failed), or None."""
+    entry = _read(path, ticker, kind)
+    return entry[1] if entry is not None else None
+
+
+def cached_failure(ticker: str, kind: str, path: str = FUND_CACHE_PATH) -> bool:
+    """Whether the last scrape of *kind* data for *ticker* failed, with no data stored."""
+    entry = _read(path, ticker, kind)
+    return entry is not None and entry[0] is None
+
+
+def _refresh_in_background(ticker: str, kind: str, fetch: Fetcher, path: str) -> None:
+    key = (path, ticker, kind)
+    with _inflight_lock:
+        if key in _inflight:
+            return
+        _inflight.add(key)
+
+    def run() -> None:
+        try:
+            refresh_fund_data(ticker, kind, fetch, path)
+        except Exception:
+            pass  # keep serving the stale entry; retried on next stale read
+        finally:
+            with _inflight_lock:
+                _inflight.discard(key)
+
+    threading.Thread(target=run, name=f"fund-refresh-{ticker}", daemon=True).start()
+
+
+def load_fund_data(
+    ticker: str,
+    kind: str,
+    fetch: Fetcher,
+    ttl_seconds: float = FUND_CACHE_TTL_SECONDS,
+    path: str = FUND_CACHE_PATH,
+) -> Any:
+    """Return cached *kind* data for *ticker* (stale-while-revalidate).
+
+    - fresh entry: returned as-is
+    - stale entry: returned as-is, refreshed in a background thread
+    - cached failure: raises ``LookupError``; retried in a background
+      thread once older than ``FAILURE_TTL_SECONDS``
+    - no entry: fetched synchronously (exceptions propagate); concurrent
+      callers missing the same entry wait for that single fetch
+    """
+    entry = _read(path, ticker, kind)
+    if entry is None:
+        key = (path, ticker, kind)
+        with _inflight_lock:
+            lock = _miss_locks.setdefault(key, threading.Lock())
+        with lock:
+            entry = _read(path, ticker, kind)
+            if entry is None:
+                return refresh_fund_data(ticker, kind, fetch, path)
+
+    value, fetched_at = entry
+    if value is None:
+        if time.time() - fetched_at >= FAILURE_TTL_SECONDS:
+            _refresh_in_background(ticker, kind, fetch, path)
+        raise LookupError(f"No {kind} data for {ticker} (last scrape failed)")
+    if time.time() - fetched_at >= ttl_seconds:
+        _refresh_in_background(ticker, kind, fetch, path)
+    return value
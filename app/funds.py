@@ -0,0 +1,165 @@
+"""Unified ETF fund-profile loader.
+
+This module is self-contained: it depends only on yfinance, the
+standard library, ``app.fund_cache`` and ``app.concurrency``, so it can
+be reused by any script that needs fund data.
+
+A single ``funds_data`` scrape per ETF yields everything the app uses
+(top holdings, sector weightings) plus the other metadata Yahoo exposes
+(asset classes, equity stats, overview). The profile is stored in the
+fund cache as one entry, so holdings.py and sectors.py share it instead
+of each scraping the same ETF.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+
+import yfinance as yf
+
+from app.concurrency import map_bounded
+from app.config import FUND_CACHE_TTL_SECONDS
+from app.fund_cache import (
+    FAILURE_TTL_SECONDS, cached_failure, fetched_at, load_fund_data, refresh_fund_data,
+)
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# A profile without any of these is treated as a failed scrape.
+COMPOSITION_FIELDS = ("top_holdings", "sector_weightings", "asset_classes")
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+@dataclass
+class FundProfile:
+    """Composition and metadata of a single ETF."""
+
+    ticker: str
+    top_holdings: list[dict] = field(default_factory=list)  # {symbol, name, weight}
+    sector_weightings: dict[str, float] = field(default_factory=dict)  # yfinance keys
+    asset_classes: dict[str, float] = field(default_factory=dict)
+    equity_holdings: dict[str, float] = field(default_factory=dict)  # P/E, P/B, ...
+    overview: dict = field(default_factory=dict)
+    description: str = ""
+
+
+# ---------------------------------------------------------------------------
+# Scraping
+# ---------------------------------------------------------------------------
+
+def _parse_top_holdings(df) -> list[dict]:
+    if df is None or df.empty:
+        return []
+    return [
+        {
+            "symbol": str(symbol),
+            "name": row["Name"],
+            "weight": float(row["Holding Percent"]),
+        }
+        for symbol, row in df.iterrows()
+    ]
+
+
+def _parse_weights(weightings) -> dict[str, float]:
+    # sector_weightings is a dict of dicts: {sector: {weight: value}}
+    # or a simple dict depending on yfinance version
+    result: dict[str, float] = {}
+    if isinstance(weightings, dict):
+        for key, value in weightings.items():
+            if isinstance(value, dict):
+                result[key] = float(list(value.values())[0])
+            else:
+                result[key] = float(value)
+    return result
+
+
+def _parse_first_column(df) -> dict[str, float]:
+    if df is None or df.empty:
+        return {}
+    column = df.iloc[:, 0]
+    return {str(k): float(v) for k, v in column.items() if v == v}  # skip NaN
+
+
+def _scrape_fund_profile(ticker: str) -> dict:
+    """Scrape every available ``funds_data`` field in one go.
+
+    Individual fields that fail are left empty; raises when no
+    composition (holdings, sectors or asset classes) could be read, so
+    failures and empty answers are not cached.
+    """
+    funds = yf.Ticker(ticker).funds_data
+    profile: dict = {}
+
+    readers = {
+        "top_holdings": lambda: _parse_top_holdings(funds.top_holdings),
+        "sector_weightings": lambda: _parse_weights(funds.sector_weightings),
+        "asset_classes": lambda: _parse_weights(funds.asset_classes),
+        "equity_holdings": lambda: _parse_first_column(funds.equity_holdings),
+        "overview": lambda: dict(funds.fund_overview or {}),
+        "description": lambda: str(funds.description or ""),
+    }
+    for key, read in readers.items():
+        try:
+            profile[key] = read()
+        except Exception:
+            pass  # left empty
+
+    if not any(profile.get(key) for key in COMPOSITION_FIELDS):
+        raise ValueError(f"No fund data available for {ticker}")
+    return profile
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def fetch_fund_profile(ticker: str) -> FundProfile:
+    """Return the (cached) fund profile of an ETF.
+
+    Returns an empty profile when data is unavailable (graceful degradation).
+    """
+    try:
+        data = load_fund_data(ticker, "profile", _scrape_fund_profile)
+    except Exception:
+        return FundProfile(ticker=ticker)
+    return FundProfile(ticker=ticker, **data)
+
+
+def refresh_fund_profiles(
+    tickers: list[str],
+    max_age_seconds: float = FUND_CACHE_TTL_SECONDS,
+    max_workers: int = 4,
+) -> dict[str, str]:
+    """Re-scrape the profiles of *tickers* stored more than *max_age_seconds* ago.
+
+    Missing profiles are scraped too, and failed scrapes are retried
+    after ``FAILURE_TTL_SECONDS``. Runs synchronously (used by the
+    background scheduler so requests never wait on a scrape). Returns an
+    error message per ticker that could not be refreshed, except those
+    already known to have no fund data (e.g. single stocks).
+    """
+    now = time.time()
+    stale = []
+    no_data = set()
+    for ticker in dict.fromkeys(tickers):
+        stored = fetched_at(ticker, "profile")
+        max_age = max_age_seconds
+        if cached_failure(ticker, "profile"):
+            no_data.add(ticker)
+            max_age = min(max_age, FAILURE_TTL_SECONDS)
+        if stored is None or now - stored >= max_age:
+            stale.append(ticker)
+
+    _, errors = map_bounded(
+        lambda t: refresh_fund_data(t, "profile", _scrape_fund_profile),
+        stale,
+        max_workers=max_workers,
+    )
+    return {t: e for t, e in errors.items() if t not in no_data}
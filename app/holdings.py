@@ -1,15 +1,16 @@
 """ETF holdings fetching and portfolio-level aggregation.
 
-This module is self-contained: it depends only on yfinance and the
-standard library, so it can be reused by any script that needs
-holdings data.
+This module is self-contained: it depends only on the standard library,
+``app.concurrency`` and ``app.funds``, so it can be reused by any script
+that needs holdings data.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-import yfinance as yf
+from app.concurrency import FETCH_MAX_WORKERS, FETCH_TIMEOUT_SECONDS, map_bounded
+from app.funds import fetch_fund_profile
 
 
 # ---------------------------------------------------------------------------
@@ -50,25 +51,11 @@ class TopHoldingsResult:
 # ---------------------------------------------------------------------------
 
 def fetch_etf_holdings(ticker: str) -> list[Holding]:
-    """Fetch the top holdings for a single ETF via yfinance.
+    """Fetch the top holdings for a single ETF (from its shared fund profile).
 
     Returns an empty list when data is unavailable (graceful degradation).
     """
-    try:
-        etf = yf.Ticker(ticker)
-        top_holdings = etf.funds_data.top_holdings
-        if top_holdings is None or top_holdings.empty:
-            return []
-        return [
-            Holding(
-                symbol=str(symbol),
-                name=row["Name"],
-                weight=float(row["Holding Percent"]),
-            )
-            for symbol, row in top_holdings.iterrows()
-        ]
-    except Exception:
-        return []
+    return [Holding(**row) for row in fetch_fund_profile(ticker).top_holdings]
 
 
 # ---------------------------------------------------------------------------
@@ -104,10 +91,18 @@ def compute_top_holdings(
     etfs_no_data: list[str] = []
     covered_mv = 0.0
 
+    # Scrape all ETFs concurrently; failures and timeouts count as no data.
+    fetched, _ = map_bounded(
+        fetch_etf_holdings,
+        [p["ticker"] for p in valid],
+        max_workers=FETCH_MAX_WORKERS,
+        timeout=FETCH_TIMEOUT_SECONDS,
+    )
+
     for pos in valid:
         ticker = pos["ticker"]
         etf_weight = pos["market_value_eur"] / total_mv
-        holdings = fetch_etf_holdings(ticker)
+        holdings = fetched.get(ticker)
 
         if not holdings:
             etfs_no_data.append(ticker)
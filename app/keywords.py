@@ -0,0 +1,89 @@
+"""Multi-keyword substring matching in a single scan.
+
+This module is self-contained: it depends only on the standard library
+(re), so it can be reused by any module that scores text against large
+keyword lists.
+
+All keywords are compiled once into a single regular expression shaped
+like a trie (common prefixes are shared), wrapped in a lookahead so the
+regex engine reports the longest keyword starting at every position of
+the text in one pass. Shorter keywords contained in a match are implied
+by it, so the result is exactly the set of keywords for which
+``keyword in text`` holds, at the cost of one C-level scan instead of
+one substring search per keyword.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex matching any of *words*, longest alternative first."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end-of-word marker
+    return _node_regex(trie)
+
+
+def _node_regex(node: dict) -> str:
+    branches = [
+        re.escape(char) + _node_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A word ends here: try to extend it first (greedy), else stop.
+        return f"(?:{body})?"
+    return body
+
+
+class KeywordMatcher:
+    """Substring matcher for labelled keyword groups, compiled once.
+
+    *groups* maps a label (e.g. a news zone) to its keywords. Matching is
+    case-insensitive on the keyword side: keywords are lowercased, the
+    caller lowercases the text. A keyword listed under several labels
+    counts for each of them.
+    """
+
+    def __init__(self, groups: dict[str, Iterable[str]]):
+        self.labels = list(groups)
+        self._labels_of: dict[str, list[str]] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                if keyword:
+                    self._labels_of.setdefault(keyword.lower(), []).append(label)
+
+        # Every keyword found also implies the keywords it contains.
+        self._implied = {
+            keyword: [other for other in self._labels_of if other in keyword]
+            for keyword in self._labels_of
+        }
+        self._pattern = re.compile(f"(?=({_trie_regex(self._labels_of)}))")
+
+    def keywords(self, text: str) -> set[str]:
+        """Return every keyword occurring in *text*."""
+        found: set[str] = set()
+        for keyword in set(self._pattern.findall(text)):
+            found.update(self._implied[keyword])
+        return found
+
+    def counts(self, text: str) -> dict[str, int]:
+        """Number of distinct keywords of each label found in *text*.
+
+        Labels are returned in the order of *groups*, including those
+        with a zero count.
+        """
+        counts = dict.fromkeys(self.labels, 0)
+        for keyword in self.keywords(text):
+            for label in self._labels_of[keyword]:
+                counts[label] += 1
+        return counts
@@ -12,37 +12,73 @@ Additional context loaded from local files:
 - context/macro/Lyn Alden/*.md: Lyn Alden premium article summaries
 - context/macro/sell-side/*.md: sell-side research summaries (JPMorgan, BofA)
 
-Results are cached in macro_outlook.yaml (valid 6 hours).
-News feed cached separately in news_cache.yaml (valid 30 min).
+Results are cached in a versioned pickle snapshot (data/macro_outlook.pickle),
+kept in memory until the file changes. Each indicator has its own TTL based
+on its release frequency, and only expired indicators are re-fetched.
+News items are appended to the local news store (data/news.sqlite),
+refreshed every 30 min with conditional GETs.
 """
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import datetime
 import glob as glob_mod
 import io
 import os
+import pickle
 import re
-from dataclasses import dataclass, field
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 
 import feedparser
 import requests
-import yaml
 import yfinance as yf
 
-from app.config import FRED_API_KEY, MACRO_CONFIG_PATH, LYN_ALDEN_DIR, SELL_SIDE_DIR
+from app.concurrency import map_bounded
+from app.config import (
+    DATA_DIR, FRED_API_KEY, MACRO_CONFIG_PATH, LYN_ALDEN_DIR, SELL_SIDE_DIR,
+)
+from app.config_registry import load_yaml
+from app.keywords import KeywordMatcher
+from app.news_store import (
+    add_items, get_feed_validators, known_ids, last_refresh, mark_refreshed,
+    news_item_id, query_items, set_feed_validators,
+)
 
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
-MACRO_OUTLOOK_PATH = "macro_outlook.yaml"
-NEWS_CACHE_PATH = "news_cache.yaml"
-CACHE_TTL_SECONDS = 6 * 3600  # 6 hours
+MACRO_OUTLOOK_PATH = os.path.join(DATA_DIR, "macro_outlook.pickle")
+# Bump whenever a dataclass stored in the outlook snapshot changes shape:
+# older snapshots are then ignored instead of unpickled into stale objects.
+OUTLOOK_SNAPSHOT_VERSION = 2
 NEWS_CACHE_TTL_SECONDS = 30 * 60  # 30 minutes
+NEWS_PAGE_SIZE = 50
+NEWS_MAX_PAGE_SIZE = 500  # upper bound of the API's news_limit
+NEWS_FETCH_MAX_WORKERS = 8
+NEWS_FETCH_TIMEOUT_SECONDS = 15  # per feed
+
+MACRO_FETCH_MAX_WORKERS = 16
+MACRO_FETCH_DEADLINE_SECONDS = 30  # whole refresh, all sources
+SOURCE_TIMEOUT_SECONDS = {"FRED": 15, "ECB": 15, "yfinance": 10}  # per indicator
+
+# Indicator freshness, by upstream release frequency. A refresh only
+# re-fetches indicators older than their own TTL.
+TTL_MARKET = 3600  # 1 hour (yfinance quotes)
+TTL_DAILY = 6 * 3600  # 6 hours
+TTL_WEEKLY = 24 * 3600  # 1 day
+TTL_MONTHLY = 2 * 24 * 3600  # 2 days
+TTL_QUARTERLY = 7 * 24 * 3600  # 1 week
+ERROR_RETRY_SECONDS = 15 * 60  # failed indicators are retried after this
+# A forced refresh also re-fetches fresh indicators with TTLs up to this.
+FORCE_REFRESH_MAX_TTL = TTL_DAILY
 
 FRED_BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
 ECB_BASE_URL = "https://data-api.ecb.europa.eu/service/data"
@@ -55,6 +91,7 @@ FRED_INDICATORS = {
         "name_fr": "IPC US (tous postes, GA)",
         "unit": "%",
         "category": "inflation",
+        "ttl_seconds": TTL_MONTHLY,
         "extra_params": {"units": "pc1"},
     },
     "us_core_cpi": {
@@ -63,6 +100,7 @@ FRED_INDICATORS = {
         "name_fr": "IPC Core US (GA)",
         "unit": "%",
         "category": "inflation",
+        "ttl_seconds": TTL_MONTHLY,
         "extra_params": {"units": "pc1"},
     },
     "us_unemployment": {
@@ -71,6 +109,7 @@ FRED_INDICATORS = {
         "name_fr": "Taux de chomage US",
         "unit": "%",
         "category": "employment",
+        "ttl_seconds": TTL_MONTHLY,
         "extra_params": {},
     },
     "fed_funds": {
@@ -79,6 +118,7 @@ FRED_INDICATORS = {
         "name_fr": "Taux directeur Fed",
         "unit": "%",
         "category": "rates",
+        "ttl_seconds": TTL_MONTHLY,
         "extra_params": {},
     },
     "ism_manufacturing": {
@@ -87,6 +127,7 @@ FRED_INDICATORS = {
         "name_fr": "Production Industrielle Manufacturiere",
         "unit": "Index",
         "category": "activity",
+        "ttl_seconds": TTL_MONTHLY,
         "extra_params": {},
     },
     "yield_curve": {
@@ -95,6 +136,7 @@ FRED_INDICATORS = {
         "name_fr": "Courbe de taux US (10A-2A)",
         "unit": "%",
         "category": "rates",
+        "ttl_seconds": TTL_DAILY,
         "extra_params": {},
     },
     "fed_balance_sheet": {
@@ -103,6 +145,7 @@ FRED_INDICATORS = {
         "name_fr": "Bilan Fed (Actifs totaux)",
         "unit": "Mrd$",
         "category": "monetary",
+        "ttl_seconds": TTL_WEEKLY,
         "extra_params": {},
     },
     "initial_claims": {
@@ -111,6 +154,7 @@ FRED_INDICATORS = {
         "name_fr": "Inscriptions chomage initiales",
         "unit": "K",
         "category": "employment",
+        "ttl_seconds": TTL_WEEKLY,
         "extra_params": {},
     },
     "consumer_sentiment": {
@@ -119,6 +163,7 @@ FRED_INDICATORS = {
         "name_fr": "Sentiment consommateurs (UMich)",
         "unit": "Index",
         "category": "sentiment",
+        "ttl_seconds": TTL_MONTHLY,
         "extra_params": {},
     },
     "hy_spread": {
@@ -127,6 +172,7 @@ FRED_INDICATORS = {
         "name_fr": "Spread credit HY US (OAS)",
         "unit": "bp",
         "category": "credit",
+        "ttl_seconds": TTL_DAILY,
         "extra_params": {},
     },
     "gdp": {
@@ -135,6 +181,7 @@ FRED_INDICATORS = {
         "name_fr": "PIB US (trimestriel)",
         "unit": "Mrd$",
         "category": "activity",
+        "ttl_seconds": TTL_QUARTERLY,
         "extra_params": {},
     },
 }
@@ -148,6 +195,7 @@ ECB_INDICATORS = {
         "name_fr": "Taux refi BCE",
         "unit": "%",
         "category": "rates",
+        "ttl_seconds": TTL_DAILY,
     },
     "eur_cpi": {
         "flow_ref": "ICP",
@@ -156,6 +204,7 @@ ECB_INDICATORS = {
         "name_fr": "IPC Zone Euro (IPCH GA)",
         "unit": "%",
         "category": "inflation",
+        "ttl_seconds": TTL_MONTHLY,
     },
 }
 
@@ -167,6 +216,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "Rendement US 10 ans",
         "unit": "%",
         "category": "rates",
+        "ttl_seconds": TTL_MARKET,
     },
     "vix": {
         "ticker": "^VIX",
@@ -174,6 +224,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "VIX (Indice de volatilite)",
         "unit": "Index",
         "category": "sentiment",
+        "ttl_seconds": TTL_MARKET,
     },
     "eurusd": {
         "ticker": "EURUSD=X",
@@ -181,6 +232,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "EUR/USD",
         "unit": "Rate",
         "category": "forex",
+        "ttl_seconds": TTL_MARKET,
     },
     "dxy": {
         "ticker": "DX-Y.NYB",
@@ -188,6 +240,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "Indice Dollar US (DXY)",
         "unit": "Index",
         "category": "forex",
+        "ttl_seconds": TTL_MARKET,
     },
     "gold": {
         "ticker": "GC=F",
@@ -195,6 +248,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "Or (USD/oz)",
         "unit": "$/oz",
         "category": "commodity",
+        "ttl_seconds": TTL_MARKET,
     },
     "btc": {
         "ticker": "BTC-USD",
@@ -202,6 +256,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "Bitcoin",
         "unit": "$",
         "category": "commodity",
+        "ttl_seconds": TTL_MARKET,
     },
     "copper": {
         "ticker": "HG=F",
@@ -209,6 +264,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "Cuivre (Futures)",
         "unit": "$/lb",
         "category": "commodity",
+        "ttl_seconds": TTL_MARKET,
     },
     "oil_wti": {
         "ticker": "CL=F",
@@ -216,6 +272,7 @@ YFINANCE_INDICATORS = {
         "name_fr": "Petrole WTI",
         "unit": "$/bbl",
         "category": "commodity",
+        "ttl_seconds": TTL_MARKET,
     },
 }
 
@@ -238,6 +295,7 @@ class MacroIndicator:
     trend: Optional[str] = None  # "up", "down", "flat"
     signal: Optional[str] = None  # "bullish", "bearish", "neutral"
     error: Optional[str] = None
+    fetched_at: Optional[float] = None  # epoch seconds
 
 
 @dataclass
@@ -345,42 +403,39 @@ def _fetch_fred_series(series_id: str, limit: int = 2,
         return []
 
 
-def _fetch_all_fred() -> dict[str, MacroIndicator]:
-    results: dict[str, MacroIndicator] = {}
-    for key, cfg in FRED_INDICATORS.items():
-        obs = _fetch_fred_series(
-            cfg["series_id"],
-            limit=2,
-            extra_params=cfg.get("extra_params"),
+def _fetch_fred_indicator(key: str) -> MacroIndicator:
+    cfg = FRED_INDICATORS[key]
+    obs = _fetch_fred_series(
+        cfg["series_id"],
+        limit=2,
+        extra_params=cfg.get("extra_params"),
+    )
+    if obs:
+        latest = obs[0]
+        previous = obs[1] if len(obs) >= 2 else None
+        try:
+            value = float(latest["value"])
+        except (ValueError, TypeError):
+            value = None
+        try:
+            prev_value = float(previous["value"]) if previous and previous["value"] != "." else None
+        except (ValueError, TypeError):
+            prev_value = None
+
+        trend = _compute_trend(value, prev_value)
+
+        return MacroIndicator(
+            key=key, name=cfg["name"], name_fr=cfg["name_fr"],
+            source="FRED", category=cfg["category"], unit=cfg["unit"],
+            value=round(value, 2) if value is not None else None,
+            previous_value=round(prev_value, 2) if prev_value is not None else None,
+            date=latest.get("date"), trend=trend,
         )
-        if obs:
-            latest = obs[0]
-            previous = obs[1] if len(obs) >= 2 else None
-            try:
-                value = float(latest["value"])
-            except (ValueError, TypeError):
-                value = None
-            try:
-                prev_value = float(previous["value"]) if previous and previous["value"] != "." else None
-            except (ValueError, TypeError):
-                prev_value = None
-
-            trend = _compute_trend(value, prev_value)
-
-            results[key] = MacroIndicator(
-                key=key, name=cfg["name"], name_fr=cfg["name_fr"],
-                source="FRED", category=cfg["category"], unit=cfg["unit"],
-                value=round(value, 2) if value is not None else None,
-                previous_value=round(prev_value, 2) if prev_value is not None else None,
-                date=latest.get("date"), trend=trend,
-            )
-        else:
-            results[key] = MacroIndicator(
-                key=key, name=cfg["name"], name_fr=cfg["name_fr"],
-                source="FRED", category=cfg["category"], unit=cfg["unit"],
-                error="Donnees FRED indisponibles",
-            )
-    return results
+    return MacroIndicator(
+        key=key, name=cfg["name"], name_fr=cfg["name_fr"],
+        source="FRED", category=cfg["category"], unit=cfg["unit"],
+        error="Donnees FRED indisponibles",
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -413,76 +468,140 @@ def _fetch_ecb_series(flow_ref: str, key: str) -> list[dict]:
         return []
 
 
-def _fetch_all_ecb() -> dict[str, MacroIndicator]:
-    results: dict[str, MacroIndicator] = {}
-    for key, cfg in ECB_INDICATORS.items():
-        obs = _fetch_ecb_series(cfg["flow_ref"], cfg["key"])
-        if obs:
-            latest = obs[0]
-            previous = obs[1] if len(obs) >= 2 else None
-            value = latest["value"]
-            prev_value = previous["value"] if previous else None
-            trend = _compute_trend(value, prev_value)
-
-            results[key] = MacroIndicator(
-                key=key, name=cfg["name"], name_fr=cfg["name_fr"],
-                source="ECB", category=cfg["category"], unit=cfg["unit"],
-                value=round(value, 2), previous_value=round(prev_value, 2) if prev_value is not None else None,
-                date=latest["date"], trend=trend,
-            )
-        else:
-            results[key] = MacroIndicator(
-                key=key, name=cfg["name"], name_fr=cfg["name_fr"],
-                source="ECB", category=cfg["category"], unit=cfg["unit"],
-                error="Donnees ECB indisponibles",
-            )
-    return results
+def _fetch_ecb_indicator(key: str) -> MacroIndicator:
+    cfg = ECB_INDICATORS[key]
+    obs = _fetch_ecb_series(cfg["flow_ref"], cfg["key"])
+    if obs:
+        latest = obs[0]
+        previous = obs[1] if len(obs) >= 2 else None
+        value = latest["value"]
+        prev_value = previous["value"] if previous else None
+        trend = _compute_trend(value, prev_value)
+
+        return MacroIndicator(
+            key=key, name=cfg["name"], name_fr=cfg["name_fr"],
+            source="ECB", category=cfg["category"], unit=cfg["unit"],
+            value=round(value, 2), previous_value=round(prev_value, 2) if prev_value is not None else None,
+            date=latest["date"], trend=trend,
+        )
+    return MacroIndicator(
+        key=key, name=cfg["name"], name_fr=cfg["name_fr"],
+        source="ECB", category=cfg["category"], unit=cfg["unit"],
+        error="Donnees ECB indisponibles",
+    )
 
 
 # ---------------------------------------------------------------------------
 # yfinance fetching
 # ---------------------------------------------------------------------------
 
-def _fetch_all_yfinance() -> dict[str, MacroIndicator]:
-    results: dict[str, MacroIndicator] = {}
-    for key, cfg in YFINANCE_INDICATORS.items():
-        try:
-            t = yf.Ticker(cfg["ticker"])
-            info = t.fast_info
-            value = info.get("lastPrice") or info.get("previousClose")
-            prev_value = info.get("previousClose") if info.get("lastPrice") else None
-            trend = _compute_trend(value, prev_value)
+def _fetch_yfinance_indicator(key: str) -> MacroIndicator:
+    cfg = YFINANCE_INDICATORS[key]
+    try:
+        t = yf.Ticker(cfg["ticker"])
+        info = t.fast_info
+        value = info.get("lastPrice") or info.get("previousClose")
+        prev_value = info.get("previousClose") if info.get("lastPrice") else None
+        trend = _compute_trend(value, prev_value)
+
+        return MacroIndicator(
+            key=key, name=cfg["name"], name_fr=cfg["name_fr"],
+            source="yfinance", category=cfg["category"], unit=cfg["unit"],
+            value=round(value, 4) if value is not None else None,
+            previous_value=round(prev_value, 4) if prev_value is not None else None,
+            date=datetime.date.today().isoformat(), trend=trend,
+        )
+    except Exception as e:
+        return MacroIndicator(
+            key=key, name=cfg["name"], name_fr=cfg["name_fr"],
+            source="yfinance", category=cfg["category"], unit=cfg["unit"],
+            error=str(e),
+        )
 
-            results[key] = MacroIndicator(
-                key=key, name=cfg["name"], name_fr=cfg["name_fr"],
-                source="yfinance", category=cfg["category"], unit=cfg["unit"],
-                value=round(value, 4) if value is not None else None,
-                previous_value=round(prev_value, 4) if prev_value is not None else None,
-                date=datetime.date.today().isoformat(), trend=trend,
-            )
-        except Exception as e:
-            results[key] = MacroIndicator(
+
+# ---------------------------------------------------------------------------
+# Concurrent fetching (all sources)
+# ---------------------------------------------------------------------------
+
+_SOURCES = {
+    "FRED": (FRED_INDICATORS, _fetch_fred_indicator),
+    "ECB": (ECB_INDICATORS, _fetch_ecb_indicator),
+    "yfinance": (YFINANCE_INDICATORS, _fetch_yfinance_indicator),
+}
+
+
+def _fetch_indicator(item: tuple[str, str]) -> MacroIndicator:
+    source, key = item
+    return _SOURCES[source][1](key)
+
+
+def _fetch_indicators(
+    items: list[tuple[str, str]],
+) -> dict[tuple[str, str], MacroIndicator]:
+    """Fetch the given ``(source, key)`` indicators concurrently.
+
+    All indicators share one bounded pool. Each call is capped by its
+    source timeout (``SOURCE_TIMEOUT_SECONDS``) and the whole batch by
+    ``MACRO_FETCH_DEADLINE_SECONDS``; indicators that miss either limit
+    come back with an error instead of blocking the refresh.
+
+    Every returned indicator is stamped with its fetch time.
+    """
+    fetched, errors = map_bounded(
+        _fetch_indicator,
+        items,
+        max_workers=MACRO_FETCH_MAX_WORKERS,
+        timeout=lambda item: SOURCE_TIMEOUT_SECONDS[item[0]],
+        deadline=time.monotonic() + MACRO_FETCH_DEADLINE_SECONDS,
+    )
+
+    now = time.time()
+    results: dict[tuple[str, str], MacroIndicator] = {}
+    for source, key in items:
+        ind = fetched.get((source, key))
+        if ind is None:
+            cfg = _SOURCES[source][0][key]
+            ind = MacroIndicator(
                 key=key, name=cfg["name"], name_fr=cfg["name_fr"],
-                source="yfinance", category=cfg["category"], unit=cfg["unit"],
-                error=str(e),
+                source=source, category=cfg["category"], unit=cfg["unit"],
+                error=f"Donnees {source} indisponibles ({errors.get((source, key), '?')})",
             )
+        ind.fetched_at = now
+        results[(source, key)] = ind
     return results
 
 
+def _needs_refresh(
+    ind: MacroIndicator,
+    now: float,
+    force_refresh: bool,
+    refresh_ahead_seconds: float = 0.0,
+) -> bool:
+    """Whether a cached indicator is older than its own TTL (or will be
+    within *refresh_ahead_seconds*)."""
+    ttl = _SOURCES[ind.source][0][ind.key]["ttl_seconds"]
+    if force_refresh and ttl <= FORCE_REFRESH_MAX_TTL:
+        return True
+    if ind.error is not None:
+        ttl = min(ttl, ERROR_RETRY_SECONDS)
+    return ind.fetched_at is None or now + refresh_ahead_seconds - ind.fetched_at >= ttl
+
+
 # ---------------------------------------------------------------------------
 # Macro config loader (mega-trends, plans, sell-side views)
 # ---------------------------------------------------------------------------
 
 def load_macro_config() -> dict:
-    """Load macro_config.yaml (mega-trends + investment plans + sell-side views)."""
-    if not os.path.exists(MACRO_CONFIG_PATH):
-        return {"mega_trends": [], "investment_plans": {"us": [], "eu": []}, "sell_side_views": []}
+    """Load macro_config.yaml (mega-trends + investment plans + sell-side views).
+
+    The parsed config is shared and read-only (see app.config_registry).
+    """
+    empty = {"mega_trends": [], "investment_plans": {"us": [], "eu": []}, "sell_side_views": []}
     try:
-        with open(MACRO_CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        return data
+        data = load_yaml(MACRO_CONFIG_PATH)
     except Exception:
-        return {"mega_trends": [], "investment_plans": {"us": [], "eu": []}, "sell_side_views": []}
+        return empty
+    return empty if data is None else data
 
 
 def _parse_mega_trends(config: dict) -> list[MegaTrend]:
@@ -933,33 +1052,33 @@ _LOW_VALUE_PATTERNS = [
 ]
 
 
-def _classify_news_zone(title: str, summary: str, source: str) -> str:
-    """Classify a news item into a thematic/geographic zone using keywords."""
+# Zones and low-value patterns are matched together, in one scan per item.
+_LOW_VALUE = "_low_value"
+_NEWS_MATCHER = KeywordMatcher({**_NEWS_ZONE_KEYWORDS, _LOW_VALUE: _LOW_VALUE_PATTERNS})
+
+
+def _classify_news(title: str, summary: str, source: str) -> tuple[str, bool]:
+    """Classify a news item into a thematic/geographic zone using keywords.
+
+    Returns ``(zone, impactful)``: the zone with the most matching
+    keywords (source hints take precedence), and whether the item is
+    free of low-impact administrative patterns.
+    """
     text = f" {title} {summary} ".lower()
+    counts = _NEWS_MATCHER.counts(text)
+    impactful = counts.pop(_LOW_VALUE) == 0
 
     # Source-based hints
     if source in ("BCE", "ECB"):
-        return "Europe"
+        return "Europe", impactful
     if source in ("Fed", "Federal Reserve"):
-        return "US"
-
-    # Keyword scoring
-    scores: dict[str, int] = {}
-    for zone, keywords in _NEWS_ZONE_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw.lower() in text)
-        if score > 0:
-            scores[zone] = score
-
-    if not scores:
-        return "Autre"
+        return "US", impactful
 
-    return max(scores, key=scores.get)
-
-
-def _is_impactful_news(item: NewsItem) -> bool:
-    """Filter out low-impact administrative news items."""
-    combined = f"{item.title} {item.summary}".lower()
-    return not any(pattern in combined for pattern in _LOW_VALUE_PATTERNS)
+    # Keyword scoring (ties go to the first zone listed)
+    zone = max(counts, key=counts.get)
+    if counts[zone] == 0:
+        return "Autre", impactful
+    return zone, impactful
 
 
 def _parse_rss_date(entry) -> str:
@@ -978,87 +1097,122 @@ def _parse_rss_date(entry) -> str:
     return datetime.date.today().isoformat()
 
 
-def _fetch_news(config: dict) -> list[NewsItem]:
-    """Fetch and parse RSS feeds from configured news sources."""
-    sources = config.get("news_sources", [])
+def _parse_feed_entries(feed, source: dict) -> list[NewsItem]:
+    """Turn the first entries of a parsed RSS feed into NewsItems.
+
+    The zone is left empty: it is classified once, when the item is
+    first added to the news store.
+    """
     items: list[NewsItem] = []
+    source_name = source.get("name", source.get("id", "?"))
+    for entry in feed.entries[:10]:
+        pub_date = _parse_rss_date(entry)
+        raw_summary = entry.get("summary", entry.get("description", ""))
+        summary = _clean_html(raw_summary)[:200]
+
+        items.append(NewsItem(
+            title=entry.get("title", "Sans titre"),
+            source=source_name,
+            date=pub_date,
+            url=entry.get("link", ""),
+            category=source.get("category", "macro"),
+            summary=summary,
+        ))
+    return items
 
-    for source in sources:
-        url = source.get("url", "")
-        if not url:
-            continue
-        try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries[:10]:
-                pub_date = _parse_rss_date(entry)
-                raw_summary = entry.get("summary", entry.get("description", ""))
-                summary = _clean_html(raw_summary)[:200]
-
-                source_name = source.get("name", source.get("id", "?"))
-                items.append(NewsItem(
-                    title=entry.get("title", "Sans titre"),
-                    source=source_name,
-                    date=pub_date,
-                    url=entry.get("link", ""),
-                    category=source.get("category", "macro"),
-                    summary=summary,
-                    zone=_classify_news_zone(
-                        entry.get("title", ""), summary, source_name,
-                    ),
-                ))
-        except Exception:
-            continue
 
-    items = [i for i in items if _is_impactful_news(i)]
-    items.sort(key=lambda x: x.date, reverse=True)
-    return items[:50]
+def _fetch_feed(source: dict) -> tuple[dict, list[NewsItem]]:
+    """Conditionally fetch one feed (ETag / Last-Modified).
 
+    Returns ``(validators, items)``. On 304 Not Modified nothing is
+    parsed and *items* is empty. Raises when the feed could not be
+    retrieved.
+    """
+    previous = get_feed_validators(source["url"])
+    headers = {"User-Agent": feedparser.USER_AGENT}
+    if previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+    if previous.get("modified"):
+        headers["If-Modified-Since"] = previous["modified"]
+    # Fetched here rather than by feedparser, which has no socket timeout:
+    # a hung feed would keep its worker thread alive after map_bounded gives up.
+    resp = requests.get(source["url"], headers=headers, timeout=NEWS_FETCH_TIMEOUT_SECONDS)
+    if resp.status_code == 304:
+        return previous, []
+    resp.raise_for_status()
+
+    feed = feedparser.parse(resp.content)
+    if feed.bozo and not feed.entries:
+        raise ValueError(f"Cannot parse feed {source['url']}: {feed.get('bozo_exception')}")
+
+    validators = {"etag": resp.headers.get("ETag"), "modified": resp.headers.get("Last-Modified")}
+    return validators, _parse_feed_entries(feed, source)
+
+
+def _fetch_news(config: dict) -> int:
+    """Fetch RSS feeds from configured news sources into the news store.
+
+    All feeds are fetched concurrently with conditional GETs. Only items
+    not already stored are classified (zone, impact) and appended.
+    Returns the number of new items.
+    """
+    by_url = {s["url"]: s for s in config.get("news_sources", []) if s.get("url")}
 
-def get_news_feed(force_refresh: bool = False) -> list[NewsItem]:
-    """Public function to get news feed (with 30-min YAML cache)."""
-    if not force_refresh and os.path.exists(NEWS_CACHE_PATH):
-        cached = _load_cached_news()
-        if cached is not None:
-            return cached
+    fetched, _ = map_bounded(
+        lambda url: _fetch_feed(by_url[url]),
+        list(by_url),
+        max_workers=NEWS_FETCH_MAX_WORKERS,
+        timeout=NEWS_FETCH_TIMEOUT_SECONDS,
+    )
+
+    candidates: dict[str, NewsItem] = {}
+    for _, items in fetched.values():
+        for item in items:
+            candidates.setdefault(news_item_id(item.url, item.title, item.source), item)
+
+    known = known_ids(list(candidates))
+    new_rows = []
+    for item_id, item in candidates.items():
+        if item_id in known:
+            continue
+        item.zone, impactful = _classify_news(item.title, item.summary, item.source)
+        new_rows.append({**asdict(item), "id": item_id, "impactful": impactful})
+    added = add_items(new_rows)
 
+    # Validators last: a feed is only marked as seen once its items are stored.
+    for url, (validators, _) in fetched.items():
+        set_feed_validators(url, validators.get("etag"), validators.get("modified"))
+    return added
+
+
+def refresh_news_feed() -> int:
+    """Fetch all configured feeds now. Returns the number of new items."""
     config = load_macro_config()
-    items = _fetch_news(config)
-    _save_news_cache(items)
-    return items
+    added = _fetch_news(config)
+    mark_refreshed()
+    return added
 
 
-def _load_cached_news() -> list[NewsItem] | None:
-    """Load news_cache.yaml if it exists and is less than 30 min old."""
-    try:
-        with open(NEWS_CACHE_PATH, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        last_updated = data.get("last_updated", "")
-        if not last_updated:
-            return None
-        updated_dt = datetime.datetime.fromisoformat(last_updated)
-        age = datetime.datetime.now() - updated_dt
-        if age.total_seconds() >= NEWS_CACHE_TTL_SECONDS:
-            return None
-        return [NewsItem(**item) for item in data.get("items", [])]
-    except Exception:
-        return None
+def get_news_feed(
+    force_refresh: bool = False,
+    zone: str | None = None,
+    limit: int = NEWS_PAGE_SIZE,
+) -> list[NewsItem]:
+    """Public function to get news feed (latest *limit* items, optionally
+    for one zone) from the news store, refreshed every 30 min."""
+    last = last_refresh()
+    if force_refresh or last is None or time.time() - last >= NEWS_CACHE_TTL_SECONDS:
+        refresh_news_feed()
+    return [NewsItem(**row) for row in query_items(limit=limit, zone=zone)]
 
 
-def _save_news_cache(items: list[NewsItem]) -> None:
-    """Save news items to news_cache.yaml."""
-    data = {
-        "last_updated": datetime.datetime.now().isoformat(timespec="seconds"),
-        "items": [
-            {
-                "title": n.title, "source": n.source, "date": n.date,
-                "url": n.url, "category": n.category, "summary": n.summary,
-                "zone": n.zone,
-            }
-            for n in items
-        ],
-    }
-    with open(NEWS_CACHE_PATH, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+async def get_news_feed_async(
+    force_refresh: bool = False,
+    zone: str | None = None,
+    limit: int = NEWS_PAGE_SIZE,
+) -> list[NewsItem]:
+    """Async variant of :func:`get_news_feed` (runs in a worker thread)."""
+    return await asyncio.to_thread(get_news_feed, force_refresh, zone, limit)
 
 
 # ---------------------------------------------------------------------------
@@ -1174,28 +1328,92 @@ def _compute_macro_synthesis(
 
 
 # ---------------------------------------------------------------------------
-# Main computation + YAML cache
+# Main computation + snapshot cache
 # ---------------------------------------------------------------------------
 
-def compute_macro_outlook(force_refresh: bool = False) -> MacroOutlook:
-    """Fetch all macro indicators and compute the aggregate outlook.
-
-    Uses a YAML cache (macro_outlook.yaml) valid for 6 hours.
-    Pass force_refresh=True to bypass the cache.
+def compute_macro_outlook(
+    force_refresh: bool = False,
+    refresh_ahead_seconds: float = 0.0,
+) -> MacroOutlook:
+    """Fetch stale macro indicators and compute the aggregate outlook.
+
+    The last outlook is kept in a snapshot cache (data/macro_outlook.pickle).
+    Each indicator has its own TTL (``ttl_seconds``, from its release
+    frequency): the cached outlook is returned as long as none has
+    expired, otherwise only the expired ones are re-fetched and re-scored
+    and the outlook is recomputed around the cached rest.
+    Pass force_refresh=True to also re-fetch market and daily series, and
+    *refresh_ahead_seconds* to also re-fetch indicators about to expire
+    (used by the background scheduler to keep the cache warm).
+
+    Refreshes are single-flight: while one runs, other callers wait for
+    it and return its result instead of refreshing again.
     """
-    if not force_refresh and os.path.exists(MACRO_OUTLOOK_PATH):
-        cached = _load_cached_outlook()
-        if cached is not None:
+    global _refresh_generation
+    cached, to_fetch = _plan_refresh(force_refresh, refresh_ahead_seconds)
+    if cached is not None and not to_fetch:
+        return cached
+
+    generation = _refresh_generation
+    with _refresh_lock:
+        if _refresh_generation != generation:
+            # A refresh completed while we were waiting: share its result.
+            latest = _load_cached_outlook()
+            if latest is not None:
+                return latest
+        cached, to_fetch = _plan_refresh(force_refresh, refresh_ahead_seconds)
+        if cached is not None and not to_fetch:
             return cached
+        result = _refresh_outlook(cached, to_fetch)
+        _refresh_generation += 1
+        return result
+
+
+def _active_sources() -> list[str]:
+    return ["FRED", "ECB", "yfinance"] if FRED_API_KEY else ["ECB", "yfinance"]
+
+
+def _plan_refresh(
+    force_refresh: bool,
+    refresh_ahead_seconds: float,
+) -> tuple[MacroOutlook | None, list[tuple[str, str]]]:
+    """Return the cached outlook and the ``(source, key)`` items to re-fetch."""
+    now = time.time()
+    cached = _load_cached_outlook()
+    previous = {(ind.source, ind.key): ind for ind in cached.indicators} if cached else {}
+    to_fetch = [
+        (source, key)
+        for source in _active_sources()
+        for key in _SOURCES[source][0]
+        if (source, key) not in previous
+        or _needs_refresh(previous[(source, key)], now, force_refresh, refresh_ahead_seconds)
+    ]
+    return cached, to_fetch
+
+
+def _refresh_outlook(
+    cached: MacroOutlook | None,
+    to_fetch: list[tuple[str, str]],
+) -> MacroOutlook:
+    """Re-fetch *to_fetch*, recompute the outlook around the cached rest and save it."""
+    previous = {(ind.source, ind.key): ind for ind in cached.indicators} if cached else {}
+    sources = _active_sources()
+    wanted = [(source, key) for source in sources for key in _SOURCES[source][0]]
+
+    fetched = _fetch_indicators(to_fetch)
+    _apply_signals(list(fetched.values()))  # cached indicators keep their signal
+
+    by_source: dict[str, dict[str, MacroIndicator]] = {source: {} for source in sources}
+    for source, key in wanted:
+        by_source[source][key] = fetched.get((source, key)) or previous[(source, key)]
 
-    # Fetch from all sources
     sources_available: list[str] = []
     sources_failed: list[str] = []
     all_indicators: list[MacroIndicator] = []
 
     # FRED
     if FRED_API_KEY:
-        fred_results = _fetch_all_fred()
+        fred_results = by_source["FRED"]
         if any(ind.error is None for ind in fred_results.values()):
             sources_available.append("FRED")
         else:
@@ -1205,7 +1423,7 @@ def compute_macro_outlook(force_refresh: bool = False) -> MacroOutlook:
         sources_failed.append("FRED (pas de cle API)")
 
     # ECB
-    ecb_results = _fetch_all_ecb()
+    ecb_results = by_source["ECB"]
     if any(ind.error is None for ind in ecb_results.values()):
         sources_available.append("ECB")
     else:
@@ -1213,15 +1431,14 @@ def compute_macro_outlook(force_refresh: bool = False) -> MacroOutlook:
     all_indicators.extend(ecb_results.values())
 
     # yfinance
-    yf_results = _fetch_all_yfinance()
+    yf_results = by_source["yfinance"]
     if any(ind.error is None for ind in yf_results.values()):
         sources_available.append("yfinance")
     else:
         sources_failed.append("yfinance")
     all_indicators.extend(yf_results.values())
 
-    # Score and compute outlook
-    _apply_signals(all_indicators)
+    # Compute outlook
     outlook_label, score = _compute_outlook(all_indicators)
 
     # Load config (mega-trends, investment plans, sell-side views)
@@ -1262,107 +1479,85 @@ def compute_macro_outlook(force_refresh: bool = False) -> MacroOutlook:
         sector_signals=sector_signals,
     )
 
-    _save_outlook_yaml(result)
+    _save_outlook_snapshot(result)
     return result
 
 
-def _load_cached_outlook() -> MacroOutlook | None:
-    """Load macro_outlook.yaml if it exists and is less than 6 hours old."""
+async def compute_macro_outlook_async(force_refresh: bool = False) -> MacroOutlook:
+    """Async variant of :func:`compute_macro_outlook` (runs in a worker thread)."""
+    return await asyncio.to_thread(compute_macro_outlook, force_refresh)
+
+
+# In-process copy of the snapshot: ((mtime_ns, size), outlook)
+_outlook_memo: tuple[tuple[int, int], MacroOutlook] | None = None
+
+# Single-flight refresh: one at a time; the generation counts completed ones.
+_refresh_lock = threading.Lock()
+_refresh_generation = 0
+
+
+def _read_outlook_snapshot(stat_key: tuple[int, int]) -> tuple | None:
+    """Unpickle the outlook snapshot; None if unreadable or from another version."""
     try:
-        with open(MACRO_OUTLOOK_PATH, "r") as f:
-            data = yaml.safe_load(f) or {}
-        last_updated = data.get("last_updated", "")
-        if not last_updated:
+        with open(MACRO_OUTLOOK_PATH, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != OUTLOOK_SNAPSHOT_VERSION:
             return None
-        updated_dt = datetime.datetime.fromisoformat(last_updated)
-        age = datetime.datetime.now() - updated_dt
-        if age.total_seconds() >= CACHE_TTL_SECONDS:
-            return None
-
-        indicators = [MacroIndicator(**ind) for ind in data.get("indicators", [])]
-        mega_trends = [MegaTrend(**mt) for mt in data.get("mega_trends", [])]
-        investment_plans = [InvestmentPlan(**ip) for ip in data.get("investment_plans", [])]
-        sell_side_views = [SellSideView(**sv) for sv in data.get("sell_side_views", [])]
-        lyn_alden_insights = [LynAldenArticle(**la) for la in data.get("lyn_alden_insights", [])]
-        sector_signals = [SectorSignal(**ss) for ss in data.get("sector_signals", [])]
-
-        return MacroOutlook(
-            outlook=data.get("outlook", "neutral"),
-            score=data.get("score", 0.0),
-            indicators=indicators,
-            last_updated=last_updated,
-            sources_available=data.get("sources_available", []),
-            sources_failed=data.get("sources_failed", []),
-            themes=data.get("themes", []),
-            mega_trends=mega_trends,
-            investment_plans=investment_plans,
-            sell_side_views=sell_side_views,
-            lyn_alden_insights=lyn_alden_insights,
-            sector_signals=sector_signals,
-        )
+        outlook = data["outlook"]
     except Exception:
         return None
+    return stat_key, outlook
 
 
-def _save_outlook_yaml(result: MacroOutlook) -> None:
-    """Persist the macro outlook to YAML for caching."""
-    data = {
-        "outlook": result.outlook,
-        "score": result.score,
-        "last_updated": result.last_updated,
-        "sources_available": result.sources_available,
-        "sources_failed": result.sources_failed,
-        "themes": result.themes,
-        "indicators": [
-            {
-                "key": ind.key, "name": ind.name, "name_fr": ind.name_fr,
-                "source": ind.source, "category": ind.category, "unit": ind.unit,
-                "value": ind.value, "previous_value": ind.previous_value,
-                "date": ind.date, "trend": ind.trend, "signal": ind.signal,
-                "error": ind.error,
-            }
-            for ind in result.indicators
-        ],
-        "mega_trends": [
-            {
-                "id": mt.id, "name_fr": mt.name_fr, "force": mt.force,
-                "change": mt.change, "catalysts": mt.catalysts,
-                "etfs_sectoriels": mt.etfs_sectoriels, "etfs_geo": mt.etfs_geo,
-                "etfs_thematiques": mt.etfs_thematiques, "sectors": mt.sectors,
-            }
-            for mt in result.mega_trends
-        ],
-        "investment_plans": [
-            {
-                "name": ip.name, "amount": ip.amount, "status": ip.status,
-                "status_detail": ip.status_detail, "change": ip.change,
-                "sectors": ip.sectors, "region": ip.region,
-            }
-            for ip in result.investment_plans
-        ],
-        "sell_side_views": [
-            {
-                "source": sv.source, "date": sv.date,
-                "forecasts": sv.forecasts, "key_themes": sv.key_themes,
-                "risks": sv.risks,
-            }
-            for sv in result.sell_side_views
-        ],
-        "lyn_alden_insights": [
-            {
-                "filename": la.filename, "date": la.date, "title": la.title,
-                "key_points": la.key_points, "portfolio_changes": la.portfolio_changes,
-            }
-            for la in result.lyn_alden_insights
-        ],
-        "sector_signals": [
-            {
-                "sector": ss.sector, "signal": ss.signal,
-                "supporting_trends": ss.supporting_trends,
-                "indicator_signals": ss.indicator_signals,
-            }
-            for ss in result.sector_signals
-        ],
-    }
-    with open(MACRO_OUTLOOK_PATH, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+def _load_cached_outlook() -> MacroOutlook | None:
+    """Return the last computed outlook, however old (None if there is none).
+
+    The snapshot file is only unpickled when its mtime or size changed
+    since the last read; otherwise the in-process copy is returned.
+    """
+    global _outlook_memo
+    try:
+        stat = os.stat(MACRO_OUTLOOK_PATH)
+    except OSError:
+        return None
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+
+    memo = _outlook_memo
+    if memo is None or memo[0] != stat_key:
+        memo = _read_outlook_snapshot(stat_key)
+        if memo is None:
+            return None
+        _outlook_memo = memo
+
+    return memo[1]
+
+
+def _save_outlook_snapshot(result: MacroOutlook) -> None:
+    """Persist the macro outlook snapshot and keep it as the in-process copy."""
+    global _outlook_memo
+    payload = pickle.dumps(
+        {"version": OUTLOOK_SNAPSHOT_VERSION, "outlook": result},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    _atomic_write(MACRO_OUTLOOK_PATH, payload)
+    stat = os.stat(MACRO_OUTLOOK_PATH)
+    _outlook_memo = ((stat.st_mtime_ns, stat.st_size), result)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write *data* to a temp file next to *path*, then rename it over *path*.
+
+    Readers see either the old file or the new one, never a partial write.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
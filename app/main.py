@@ -1,23 +1,47 @@
+import asyncio
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
 
 from app.allocation import compute_smart_allocation
-from app.database import init_db, get_db
+from app.config import (
+    CONFIG_WATCH_SECONDS, FUND_CACHE_TTL_SECONDS, SCHEDULER_ENABLED, SCHEDULER_FUNDS_SECONDS,
+    SCHEDULER_JITTER, SCHEDULER_MACRO_SECONDS, SCHEDULER_NAV_SECONDS, SCHEDULER_NEWS_SECONDS,
+    SCHEDULER_QUOTES_SECONDS,
+)
+from app.config_registry import start_watching
+from app.covariance import compute_correlations
+from app.database import init_db
+from app.funds import fetch_fund_profile, refresh_fund_profiles
 from app.holdings import compute_top_holdings
-from app.macro import compute_macro_outlook, get_news_feed, load_macro_config
-from app.performance import compute_performance, PERIODS
+from app.macro import (
+    NEWS_MAX_PAGE_SIZE, NEWS_PAGE_SIZE, compute_macro_outlook, compute_macro_outlook_async,
+    get_news_feed_async, load_macro_config, refresh_news_feed,
+)
+from app.performance import compute_performance_async, compute_returns_async, refresh_nav, PERIODS
+from app.risk import compute_risk
+from app.scheduler import Scheduler
 from app.sectors import compute_sector_exposure
 from app.target import load_target_portfolio, compute_drift
-from app.models import Position
-from app.portfolio import load_portfolio, load_transactions, aggregate_positions, enrich_positions
+from app.position_store import save_positions
+from app.portfolio import (
+    load_portfolio, load_transactions, aggregate_positions, enrich_positions_async,
+    fetch_quotes, quote_cache_stats,
+)
+
+
+scheduler = Scheduler(jitter=SCHEDULER_JITTER)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    start_watching(CONFIG_WATCH_SECONDS)
+    if SCHEDULER_ENABLED:
+        scheduler.start()
     yield
+    await scheduler.stop()
 
 
 app = FastAPI(title="Invest Buddy", lifespan=lifespan)
@@ -28,27 +52,62 @@ def _load_aggregated() -> list[dict]:
     return aggregate_positions(load_portfolio(), load_transactions())
 
 
-def _get_smart_allocation():
+async def _load_enriched() -> list[dict]:
+    """Load aggregated positions and price them without blocking the loop."""
+    aggregated = await asyncio.to_thread(_load_aggregated)
+    return await enrich_positions_async(aggregated)
+
+
+async def _get_smart_allocation():
     """Compute smart theme allocation from current macro outlook."""
-    macro = compute_macro_outlook()
-    config = load_macro_config()
+    macro = await compute_macro_outlook_async()
+    config = await asyncio.to_thread(load_macro_config)
     allocation_themes = config.get("allocation_themes", [])
     if not allocation_themes:
         return None
     return compute_smart_allocation(macro, allocation_themes)
 
 
-@app.get("/portfolio")
-def get_portfolio(db: Session = Depends(get_db)):
-    aggregated = _load_aggregated()
-    enriched = enrich_positions(aggregated)
+# ---------------------------------------------------------------------------
+# Background cache warming
+# ---------------------------------------------------------------------------
 
-    # Persist to database
-    db.query(Position).delete()
-    for pos in enriched:
-        db.add(Position(**pos))
-    db.commit()
+def _held_tickers() -> list[str]:
+    return list(dict.fromkeys(p["ticker"] for p in _load_aggregated()))
+
+
+def _warm_quotes() -> None:
+    _, errors = fetch_quotes(_held_tickers(), force=True)
+    if errors:
+        raise RuntimeError(f"quotes unavailable: {', '.join(sorted(errors))}")
+
+
+def _warm_macro() -> None:
+    # Re-fetch indicators that would expire before the next run.
+    ahead = SCHEDULER_MACRO_SECONDS * (1 + SCHEDULER_JITTER)
+    compute_macro_outlook(refresh_ahead_seconds=ahead)
 
+
+def _warm_funds() -> None:
+    max_age = FUND_CACHE_TTL_SECONDS - SCHEDULER_FUNDS_SECONDS * (1 + SCHEDULER_JITTER)
+    errors = refresh_fund_profiles(_held_tickers(), max_age_seconds=max_age)
+    if errors:
+        raise RuntimeError(f"fund data unavailable: {', '.join(sorted(errors))}")
+
+
+def _warm_nav() -> None:
+    refresh_nav(_load_aggregated())
+
+
+scheduler.add_job("quotes", _warm_quotes, SCHEDULER_QUOTES_SECONDS)
+scheduler.add_job("macro", _warm_macro, SCHEDULER_MACRO_SECONDS)
+scheduler.add_job("news", refresh_news_feed, SCHEDULER_NEWS_SECONDS)
+scheduler.add_job("funds", _warm_funds, SCHEDULER_FUNDS_SECONDS)
+scheduler.add_job("nav", _warm_nav, SCHEDULER_NAV_SECONDS)
+
+
+def _portfolio_view(enriched: list[dict]) -> dict:
+    """Positions with totals per account and overall."""
     # Compute totals per account (in EUR)
     accounts: dict[str, dict] = {}
     for pos in enriched:
@@ -89,13 +148,17 @@ def get_portfolio(db: Session = Depends(get_db)):
     }
 
 
-@app.get("/holdings/top")
-def get_top_holdings(top_n: int = 20):
-    """Top N effective holdings across the portfolio."""
-    aggregated = _load_aggregated()
-    enriched = enrich_positions(aggregated)
-    result = compute_top_holdings(enriched, top_n=top_n)
+@app.get("/portfolio")
+async def get_portfolio(background_tasks: BackgroundTasks):
+    enriched = await _load_enriched()
+
+    # Persist to database once the response is sent (only changed rows)
+    background_tasks.add_task(save_positions, enriched)
+
+    return _portfolio_view(enriched)
 
+
+def _holdings_view(result) -> dict:
     return {
         "top_holdings": [
             {
@@ -115,13 +178,15 @@ def get_top_holdings(top_n: int = 20):
     }
 
 
-@app.get("/sectors")
-def get_sectors():
-    """Sector exposure across the portfolio."""
-    aggregated = _load_aggregated()
-    enriched = enrich_positions(aggregated)
-    result = compute_sector_exposure(enriched)
+@app.get("/holdings/top")
+async def get_top_holdings(top_n: int = 20):
+    """Top N effective holdings across the portfolio."""
+    enriched = await _load_enriched()
+    result = await asyncio.to_thread(compute_top_holdings, enriched, top_n)
+    return _holdings_view(result)
+
 
+def _sectors_view(result) -> dict:
     return {
         "sectors": [
             {
@@ -139,17 +204,38 @@ def get_sectors():
     }
 
 
-@app.get("/performance")
-def get_performance(period: str = "ALL"):
-    """Historical portfolio performance (P&L % and drawdown over time)."""
+@app.get("/sectors")
+async def get_sectors():
+    """Sector exposure across the portfolio."""
+    enriched = await _load_enriched()
+    result = await asyncio.to_thread(compute_sector_exposure, enriched)
+    return _sectors_view(result)
+
+
+@app.get("/funds/{ticker}")
+async def get_fund_profile(ticker: str):
+    """Cached fund profile of an ETF (holdings, sectors, asset classes, stats)."""
+    profile = await asyncio.to_thread(fetch_fund_profile, ticker)
+    return {
+        "ticker": profile.ticker,
+        "top_holdings": profile.top_holdings,
+        "sector_weightings": profile.sector_weightings,
+        "asset_classes": profile.asset_classes,
+        "equity_holdings": profile.equity_holdings,
+        "overview": profile.overview,
+        "description": profile.description,
+    }
+
+
+def _check_period(period: str) -> None:
     if period not in PERIODS:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid period '{period}'. Must be one of: {', '.join(sorted(PERIODS))}",
         )
-    aggregated = _load_aggregated()
-    result = compute_performance(aggregated, period=period)
 
+
+def _performance_view(result) -> dict:
     return {
         "period": result.period,
         "start_date": result.start_date,
@@ -169,11 +255,56 @@ def get_performance(period: str = "ALL"):
     }
 
 
-@app.get("/macro")
-def get_macro(refresh: bool = False):
-    """Macro economic indicators, outlook, mega-trends, plans, insights & news."""
-    result = compute_macro_outlook(force_refresh=refresh)
-    news = get_news_feed(force_refresh=refresh)
+@app.get("/performance")
+async def get_performance(period: str = "ALL"):
+    """Historical portfolio performance (P&L % and drawdown over time)."""
+    _check_period(period)
+    aggregated = await asyncio.to_thread(_load_aggregated)
+    result = await compute_performance_async(aggregated, period=period)
+    return _performance_view(result)
+
+
+@app.get("/risk")
+async def get_risk():
+    """Volatility, Sharpe/Sortino, VaR/CVaR, drawdown and beta per ticker and for the portfolio."""
+    aggregated = await asyncio.to_thread(_load_aggregated)
+    result = await asyncio.to_thread(compute_risk, aggregated)
+    return asdict(result)
+
+
+@app.get("/correlation")
+async def get_correlation():
+    """EWMA correlations and volatilities of held and target tickers, and both portfolios' volatility."""
+    aggregated, target = await asyncio.gather(
+        asyncio.to_thread(_load_aggregated),
+        asyncio.to_thread(load_target_portfolio),
+    )
+    targets = [(a.ticker, a.weight_pct, a.currency) for a in target.allocations]
+    result = await asyncio.to_thread(compute_correlations, aggregated, targets)
+    return asdict(result)
+
+
+@app.get("/returns")
+async def get_returns(period: str = "ALL"):
+    """Time-weighted (TWR) and money-weighted (MWR/XIRR) returns per portfolio, account and ticker."""
+    _check_period(period)
+    aggregated = await asyncio.to_thread(_load_aggregated)
+    result = await compute_returns_async(aggregated, period=period)
+    return {
+        "period": result.period,
+        "start_date": result.start_date,
+        "end_date": result.end_date,
+        "portfolio": asdict(result.portfolio) if result.portfolio else None,
+        "accounts": {name: asdict(m) for name, m in result.accounts.items()},
+        "tickers": {name: asdict(m) for name, m in result.tickers.items()},
+    }
+
+
+async def _load_macro(refresh: bool, news_zone: str | None, news_limit: int) -> dict:
+    result, news = await asyncio.gather(
+        compute_macro_outlook_async(force_refresh=refresh),
+        get_news_feed_async(force_refresh=refresh, zone=news_zone, limit=news_limit),
+    )
 
     return {
         "outlook": result.outlook,
@@ -196,6 +327,7 @@ def get_macro(refresh: bool = False):
                 "trend": ind.trend,
                 "signal": ind.signal,
                 "error": ind.error,
+                "fetched_at": ind.fetched_at,
             }
             for ind in result.indicators
         ],
@@ -269,14 +401,19 @@ def get_macro(refresh: bool = False):
     }
 
 
-@app.get("/target")
-def get_target(mode: str = "smart"):
-    """Target portfolio allocations.
+@app.get("/macro")
+async def get_macro(
+    refresh: bool = False,
+    news_zone: str | None = None,
+    news_limit: int = Query(NEWS_PAGE_SIZE, ge=1, le=NEWS_MAX_PAGE_SIZE),
+):
+    """Macro economic indicators, outlook, mega-trends, plans, insights & news."""
+    return await _load_macro(refresh, news_zone, news_limit)
 
-    mode: "smart" (theme-based macro-derived with rationale) or "static" (target_portfolio.yaml)
-    """
+
+async def _load_target(mode: str) -> dict:
     if mode == "smart":
-        smart = _get_smart_allocation()
+        smart = await _get_smart_allocation()
         if smart and smart.themes:
             return {
                 "themes": [
@@ -296,7 +433,7 @@ def get_target(mode: str = "smart"):
             }
 
     # Fallback to static
-    result = load_target_portfolio()
+    result = await asyncio.to_thread(load_target_portfolio)
     return {
         "allocations": [
             {
@@ -311,14 +448,16 @@ def get_target(mode: str = "smart"):
     }
 
 
-@app.get("/drift")
-def get_drift():
-    """Portfolio drift vs static target allocations (target_portfolio.yaml)."""
-    aggregated = _load_aggregated()
-    enriched = enrich_positions(aggregated)
-    target = load_target_portfolio()
-    result = compute_drift(enriched, target)
+@app.get("/target")
+async def get_target(mode: str = "smart"):
+    """Target portfolio allocations.
+
+    mode: "smart" (theme-based macro-derived with rationale) or "static" (target_portfolio.yaml)
+    """
+    return await _load_target(mode)
 
+
+def _drift_view(result) -> dict:
     return {
         "entries": [
             {
@@ -339,6 +478,94 @@ def get_drift():
     }
 
 
+@app.get("/drift")
+async def get_drift():
+    """Portfolio drift vs static target allocations (target_portfolio.yaml)."""
+    enriched, target = await asyncio.gather(
+        _load_enriched(),
+        asyncio.to_thread(load_target_portfolio),
+    )
+    return _drift_view(compute_drift(enriched, target))
+
+
+DASHBOARD_SECTIONS = ("portfolio", "holdings", "sectors", "performance", "macro", "target", "drift")
+_PRICED_SECTIONS = {"portfolio", "holdings", "sectors", "drift"}
+
+
+@app.get("/dashboard")
+async def get_dashboard(
+    background_tasks: BackgroundTasks,
+    sections: str = ",".join(DASHBOARD_SECTIONS),
+    period: str = "ALL",
+    target_mode: str = "smart",
+    top_n: int = 20,
+    refresh: bool = False,
+    news_zone: str | None = None,
+    news_limit: int = Query(NEWS_PAGE_SIZE, ge=1, le=NEWS_MAX_PAGE_SIZE),
+):
+    """Every dashboard view from one snapshot of the portfolio.
+
+    Positions are loaded and priced once, then each requested section
+    (comma-separated, default all) is derived from that snapshot
+    concurrently. A section that fails is reported under ``errors``
+    instead of failing the whole response.
+    """
+    wanted = [name.strip() for name in sections.split(",") if name.strip()]
+    unknown = [name for name in wanted if name not in DASHBOARD_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sections {unknown}. Must be among: {', '.join(DASHBOARD_SECTIONS)}",
+        )
+    if "performance" in wanted:
+        _check_period(period)
+
+    aggregated = await asyncio.to_thread(_load_aggregated)
+    enriched = None
+    if _PRICED_SECTIONS.intersection(wanted):
+        enriched = await enrich_positions_async(aggregated)
+
+    async def build(name: str) -> dict:
+        if name == "portfolio":
+            background_tasks.add_task(save_positions, enriched)
+            return _portfolio_view(enriched)
+        if name == "holdings":
+            return _holdings_view(await asyncio.to_thread(compute_top_holdings, enriched, top_n))
+        if name == "sectors":
+            return _sectors_view(await asyncio.to_thread(compute_sector_exposure, enriched))
+        if name == "performance":
+            return _performance_view(await compute_performance_async(aggregated, period=period))
+        if name == "macro":
+            return await _load_macro(refresh, news_zone, news_limit)
+        if name == "target":
+            return await _load_target(target_mode)
+        target = await asyncio.to_thread(load_target_portfolio)
+        return _drift_view(compute_drift(enriched, target))
+
+    names = list(dict.fromkeys(wanted))
+    results = await asyncio.gather(*(build(name) for name in names), return_exceptions=True)
+
+    response: dict = {"errors": {}}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            response["errors"][name] = str(result) or type(result).__name__
+        else:
+            response[name] = result
+    return response
+
+
+@app.get("/cache/quotes")
+def get_quote_cache():
+    """Hit/miss counters of the shared live-quote cache."""
+    return quote_cache_stats()
+
+
+@app.get("/scheduler")
+def get_scheduler():
+    """Background refresh jobs: intervals, last-run timings and errors."""
+    return {"running": scheduler.running, "jobs": scheduler.status()}
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
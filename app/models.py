@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime, Date
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -6,6 +6,10 @@ from app.database import Base
 
 class Position(Base):
     __tablename__ = "positions"
+    __table_args__ = (
+        # One row per position; also the conflict target of the upsert.
+        Index("uq_positions_ticker_account", "ticker", "account", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ticker = Column(String, nullable=False)
@@ -22,3 +26,44 @@ class Position(Base):
     pnl_pct = Column(Float)
     purchase_date = Column(String)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class DailyNav(Base):
+    """Materialized daily valuation of the whole portfolio (EUR)."""
+
+    __tablename__ = "nav_daily"
+
+    date = Column(Date, primary_key=True)
+    value_eur = Column(Float, nullable=False)
+    cost_basis_eur = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class DailyNavContribution(Base):
+    """Per-position (ticker, account) share of a :class:`DailyNav` row (EUR)."""
+
+    __tablename__ = "nav_contributions"
+
+    date = Column(Date, primary_key=True)
+    ticker = Column(String, primary_key=True)
+    account = Column(String, primary_key=True)
+    value_eur = Column(Float, nullable=False)
+    cost_basis_eur = Column(Float, nullable=False)
+
+
+class NavLot(Base):
+    """Buy lots the stored NAV rows were computed from.
+
+    Diffed against the current lots to find the first date to recompute
+    (e.g. after a back-dated transaction).
+    """
+
+    __tablename__ = "nav_lots"
+
+    id = Column(Integer, primary_key=True)
+    ticker = Column(String, nullable=False)
+    account = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
+    qty = Column(Float, nullable=False)
+    price = Column(Float, nullable=False)
+    currency = Column(String, nullable=False)
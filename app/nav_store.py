@@ -0,0 +1,135 @@
+"""Materialized daily portfolio valuation (NAV) in the database.
+
+This module is self-contained: it depends only on SQLAlchemy and the
+NAV models (``app.models``), so it can be reused by any script that
+reads or rebuilds the valuation history.
+
+One row per trading day holds the portfolio value and cost basis in
+EUR, with the per-position (ticker, account) contributions in a side
+table. Past days are never recomputed unless the lots they were
+computed from change: the lots used for the last rebuild are stored
+too, so a back-dated transaction invalidates the history from its date
+only. Reads are range queries on the date primary key.
+"""
+
+from __future__ import annotations
+
+import datetime
+from collections import Counter
+from typing import Callable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import DailyNav, DailyNavContribution, NavLot
+
+
+# A lot as stored: (ticker, account, date, qty, price, currency).
+LotKey = tuple[str, str, datetime.date, float, float, str]
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def first_changed_date(
+    lots: list[LotKey],
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> datetime.date | None:
+    """Earliest date of a lot added, removed or edited since the last rebuild.
+
+    Returns None when *lots* match the stored ones.
+    """
+    with session_factory() as db:
+        stored = Counter(
+            tuple(row) for row in db.execute(
+                select(
+                    NavLot.ticker, NavLot.account, NavLot.date,
+                    NavLot.qty, NavLot.price, NavLot.currency,
+                )
+            )
+        )
+    current = Counter(lots)
+    changed = (stored - current) + (current - stored)
+    return min((lot[2] for lot in changed), default=None)
+
+
+def last_date(
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> datetime.date | None:
+    """Date of the most recent stored NAV row."""
+    with session_factory() as db:
+        return db.execute(select(func.max(DailyNav.date))).scalar()
+
+
+def load_nav(
+    start: datetime.date,
+    end: datetime.date,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> list[tuple[datetime.date, float, float]]:
+    """``(date, value_eur, cost_basis_eur)`` rows between *start* and *end*."""
+    with session_factory() as db:
+        rows = db.execute(
+            select(DailyNav.date, DailyNav.value_eur, DailyNav.cost_basis_eur)
+            .where(DailyNav.date >= start, DailyNav.date <= end)
+            .order_by(DailyNav.date)
+        )
+        return [tuple(row) for row in rows]
+
+
+def load_contributions(
+    start: datetime.date,
+    end: datetime.date,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> list[tuple[datetime.date, str, str, float, float]]:
+    """``(date, ticker, account, value_eur, cost_basis_eur)`` rows between *start* and *end*."""
+    with session_factory() as db:
+        rows = db.execute(
+            select(
+                DailyNavContribution.date, DailyNavContribution.ticker,
+                DailyNavContribution.account, DailyNavContribution.value_eur,
+                DailyNavContribution.cost_basis_eur,
+            )
+            .where(DailyNavContribution.date >= start, DailyNavContribution.date <= end)
+            .order_by(
+                DailyNavContribution.date, DailyNavContribution.ticker,
+                DailyNavContribution.account,
+            )
+        )
+        return [tuple(row) for row in rows]
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+def replace_from(
+    start: datetime.date,
+    nav: list[dict],
+    contributions: list[dict],
+    lots: list[LotKey],
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> None:
+    """Replace every row dated *start* or later, and record *lots*.
+
+    *nav* and *contributions* are dicts with the column names of
+    ``nav_daily`` and ``nav_contributions``. Runs in one transaction,
+    so readers see either the old or the new history.
+    """
+    with session_factory() as db, db.begin():
+        db.execute(delete(DailyNav).where(DailyNav.date >= start))
+        db.execute(delete(DailyNavContribution).where(DailyNavContribution.date >= start))
+        if nav:
+            db.execute(insert(DailyNav), nav)
+        if contributions:
+            db.execute(insert(DailyNavContribution), contributions)
+        db.execute(delete(NavLot))
+        if lots:
+            db.execute(
+                insert(NavLot),
+                [
+                    {"ticker": t, "account": a, "date": d, "qty": q, "price": p, "currency": c}
+                    for t, a, d, q, p, c in lots
+                ],
+            )
@@ -0,0 +1,188 @@
+"""Append-only local store of RSS news items.
+
+This module is self-contained: it depends only on the standard library
+(sqlite3, hashlib), so it can be reused by any script that needs the
+news history.
+
+Items are keyed by a hash of their URL (or source + title when the feed
+gives no link), so refreshes only append items never seen before and
+derived fields such as the zone are computed once per item. Reads are
+indexed queries by date (optionally filtered by zone), so their cost
+depends on the page size, not on the size of the history. The store
+also keeps each feed's HTTP validators (ETag / Last-Modified) for
+conditional GETs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from app.config import DATA_DIR
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+NEWS_STORE_PATH = os.path.join(DATA_DIR, "news.sqlite")
+
+ITEM_FIELDS = ("title", "source", "date", "url", "category", "summary", "zone")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_items (
+    id         TEXT PRIMARY KEY,
+    title      TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    category   TEXT NOT NULL,
+    summary    TEXT NOT NULL,
+    zone       TEXT NOT NULL,
+    impactful  INTEGER NOT NULL,
+    first_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_news_date ON news_items (impactful, date DESC);
+CREATE INDEX IF NOT EXISTS idx_news_zone_date ON news_items (zone, impactful, date DESC);
+CREATE TABLE IF NOT EXISTS feeds (
+    url        TEXT PRIMARY KEY,
+    etag       TEXT,
+    modified   TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_init_lock = threading.Lock()
+_initialized_paths: set[str] = set()
+
+
+# ---------------------------------------------------------------------------
+# Storage helpers
+# ---------------------------------------------------------------------------
+
+def _connect(path: str) -> sqlite3.Connection:
+    if path not in _initialized_paths:
+        with _init_lock:
+            if path not in _initialized_paths:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with closing(sqlite3.connect(path)) as conn:
+                    conn.executescript(_SCHEMA)
+                _initialized_paths.add(path)
+    return sqlite3.connect(path, timeout=30)
+
+
+def news_item_id(url: str, title: str, source: str) -> str:
+    """Stable dedup key of a news item."""
+    key = url.strip() or f"{source}\n{title.strip().lower()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Items
+# ---------------------------------------------------------------------------
+
+def known_ids(ids: list[str], path: str = NEWS_STORE_PATH) -> set[str]:
+    """Return the subset of *ids* already stored."""
+    if not ids:
+        return set()
+    with closing(_connect(path)) as conn:
+        placeholders = ",".join("?" * len(ids))
+        rows = conn.execute(
+            f"SELECT id FROM news_items WHERE id IN ({placeholders})", ids,
+        ).fetchall()
+    return {r[0] for r in rows}
+
+
+def add_items(items: list[dict], path: str = NEWS_STORE_PATH) -> int:
+    """Append items (dicts with ``id``, ``impactful`` and ITEM_FIELDS).
+
+    Items whose id is already stored are ignored. Returns the number of
+    items actually added.
+    """
+    now = time.time()
+    rows = [
+        (item["id"], *(item[f] for f in ITEM_FIELDS), int(item["impactful"]), now)
+        for item in items
+    ]
+    with closing(_connect(path)) as conn, conn:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO news_items "
+            "(id, title, source, date, url, category, summary, zone, impactful, first_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return conn.total_changes - before
+
+
+def query_items(
+    limit: int = 50,
+    zone: str | None = None,
+    path: str = NEWS_STORE_PATH,
+) -> list[dict]:
+    """Latest impactful items, newest first, optionally for one zone."""
+    columns = ", ".join(ITEM_FIELDS)
+    sql = f"SELECT {columns} FROM news_items WHERE impactful = 1"
+    params: list = []
+    if zone:
+        sql += " AND zone = ?"
+        params.append(zone)
+    sql += " ORDER BY date DESC, rowid LIMIT ?"
+    params.append(limit)
+    with closing(_connect(path)) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [dict(zip(ITEM_FIELDS, row)) for row in rows]
+
+
+# ---------------------------------------------------------------------------
+# Feed validators and refresh bookkeeping
+# ---------------------------------------------------------------------------
+
+def get_feed_validators(url: str, path: str = NEWS_STORE_PATH) -> dict:
+    """Return ``{"etag": ..., "modified": ...}`` stored for a feed."""
+    with closing(_connect(path)) as conn:
+        row = conn.execute(
+            "SELECT etag, modified FROM feeds WHERE url = ?", (url,),
+        ).fetchone()
+    if row is None:
+        return {}
+    return {"etag": row[0], "modified": row[1]}
+
+
+def set_feed_validators(
+    url: str,
+    etag: str | None,
+    modified: str | None,
+    path: str = NEWS_STORE_PATH,
+) -> None:
+    with closing(_connect(path)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO feeds (url, etag, modified, fetched_at) "
+            "VALUES (?, ?, ?, ?)",
+            (url, etag, modified, time.time()),
+        )
+
+
+def last_refresh(path: str = NEWS_STORE_PATH) -> float | None:
+    """Epoch time of the last completed refresh, or None."""
+    with closing(_connect(path)) as conn:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'last_refresh'",
+        ).fetchone()
+    return float(row[0]) if row else None
+
+
+def mark_refreshed(path: str = NEWS_STORE_PATH) -> None:
+    with closing(_connect(path)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_refresh', ?)",
+            (str(time.time()),),
+        )
@@ -1,17 +1,34 @@
 """Historical portfolio performance computation.
 
 This module is self-contained: it depends only on yfinance, pandas,
-and the standard library, so it can be reused by any script that
-needs historical performance data.
+numpy, the standard library, ``app.concurrency``, the local price store
+(``app.price_store``) and the materialized NAV (``app.nav_store``), so it
+can be reused by any script that needs historical performance data.
+The NAV store is imported on first use only: the valuation and price
+helpers work without a database.
+
+Daily valuations are stored once per trading day: a call values only
+the days missing since the last one (or, after a back-dated lot, the
+days from that lot's date), then reads the requested period as a date
+range query.
 """
 
 from __future__ import annotations
 
+import asyncio
 import datetime
+import threading
+import time
 from dataclasses import dataclass, field
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError
+
+from app import returns
+from app.concurrency import map_bounded
+from app.price_store import TAIL_REFRESH_SECONDS, load_closes
 
 
 # ---------------------------------------------------------------------------
@@ -22,6 +39,16 @@ PERIODS = {"1M", "3M", "6M", "1Y", "YTD", "ALL"}
 
 BASE_CURRENCY = "EUR"
 
+HISTORY_MAX_WORKERS = 8
+
+# Today's close is provisional: re-value the last stored day this often.
+NAV_REFRESH_SECONDS = TAIL_REFRESH_SECONDS
+NAV_LOOKBACK_DAYS = 7  # weekends and holidays before a rebuild start
+
+_nav_lock = threading.Lock()
+_nav_synced: tuple[list, float] | None = None  # (sorted lot keys, monotonic time)
+_nav_generation = 0  # bumped whenever the stored NAV is rewritten
+
 
 # ---------------------------------------------------------------------------
 # Data structures
@@ -49,6 +76,63 @@ class PerformanceResult:
     end_date: str = ""
 
 
+@dataclass
+class ReturnMetrics:
+    """Returns of one series (portfolio, account or ticker) over a period."""
+
+    value_eur: float
+    invested_eur: float  # value at the start of the period + net contributions
+    twr_pct: float | None
+    mwr_pct: float | None
+    twr_annualized_pct: float | None  # None when held less than a year
+    mwr_annualized_pct: float | None
+
+
+@dataclass
+class ReturnsResult:
+    """Time- and money-weighted returns per portfolio, account and ticker."""
+
+    period: str = "ALL"
+    start_date: str = ""
+    end_date: str = ""
+    portfolio: ReturnMetrics | None = None
+    accounts: dict[str, ReturnMetrics] = field(default_factory=dict)
+    tickers: dict[str, ReturnMetrics] = field(default_factory=dict)
+
+
+@dataclass
+class _SeriesCache:
+    """Full NAV history and the periods sliced from it, for one NAV version."""
+
+    key: tuple[int, datetime.date]  # (NAV generation, today)
+    ordinals: np.ndarray
+    dates: list[datetime.date]
+    values: np.ndarray
+    costs: np.ndarray
+    results: dict[str, PerformanceResult] = field(default_factory=dict)
+
+
+_series_cache: _SeriesCache | None = None
+
+
+@dataclass
+class _ViewsCache:
+    """Daily values and cash flows of every returns view, for one NAV version.
+
+    One row per view: the portfolio, then each account, then each ticker.
+    """
+
+    key: tuple[int, datetime.date]  # (NAV generation, today)
+    ordinals: np.ndarray
+    views: list[tuple[str, str]]  # ("portfolio", "") / ("account", name) / ("ticker", symbol)
+    values: np.ndarray  # views x dates
+    flows: np.ndarray  # views x dates, EUR invested on each date
+    results: dict[str, ReturnsResult] = field(default_factory=dict)
+
+
+_views_cache: _ViewsCache | None = None
+
+
 # ---------------------------------------------------------------------------
 # Period resolution
 # ---------------------------------------------------------------------------
@@ -77,28 +161,49 @@ def _resolve_start_date(
 # Historical data fetching
 # ---------------------------------------------------------------------------
 
-def _fetch_historical_prices(
+def _download_closes(
     ticker: str,
     start: datetime.date,
     end: datetime.date,
 ) -> pd.Series:
-    """Fetch daily Close prices for a ticker between *start* and *end*.
+    """Download daily Close prices for a ticker from yfinance.
 
-    Returns a pandas Series indexed by ``datetime.date``.
-    Returns an empty Series on failure.
+    Returns a pandas Series indexed by ``datetime.date``. Errors are
+    raised (yfinance otherwise reports them as an empty frame), except
+    when Yahoo answers with no rows for the range (a weekend, a holiday,
+    before the listing date): the Series is then empty, and the price
+    store records the range as covered instead of retrying it.
     """
+    t = yf.Ticker(ticker)
     try:
-        t = yf.Ticker(ticker)
         df = t.history(
             start=start.isoformat(),
             end=(end + datetime.timedelta(days=1)).isoformat(),
             interval="1d",
+            raise_errors=True,
         )
-        if df.empty:
-            return pd.Series(dtype=float)
-        series = df["Close"]
-        series.index = series.index.date
-        return series
+    except YFPricesMissingError:
+        return pd.Series(dtype=float)
+    if df.empty:
+        return pd.Series(dtype=float)
+    series = df["Close"]
+    series.index = series.index.date
+    return series
+
+
+def _fetch_historical_prices(
+    ticker: str,
+    start: datetime.date,
+    end: datetime.date,
+) -> pd.Series:
+    """Fetch daily Close prices for a ticker between *start* and *end*.
+
+    Served from the local price store; only the range not stored yet is
+    downloaded. Returns a pandas Series indexed by ``datetime.date``.
+    Returns an empty Series on failure.
+    """
+    try:
+        return load_closes(ticker, start, end, _download_closes)
     except Exception:
         return pd.Series(dtype=float)
 
@@ -118,33 +223,67 @@ def _fetch_historical_fx_rate(
     return _fetch_historical_prices(f"{pair}=X", start, end)
 
 
-def _get_fx_rate_on_date(
+# Purchase-date FX rates never change: memoized for the process lifetime.
+_purchase_fx_cache: dict[tuple[str, str, datetime.date], float] = {}
+
+
+def _get_fx_rates_on_dates(
     from_currency: str,
     to_currency: str,
-    target_date: datetime.date,
-) -> float:
-    """Fetch the FX rate on a specific date (for fixed cost basis).
-
-    Looks at a small window around the target date to handle weekends
-    and holidays, returns the closest available rate.
+    target_dates: list[datetime.date],
+) -> dict[datetime.date, float]:
+    """Return the FX rate on each of *target_dates* (for fixed cost basis).
+
+    Loads a single FX series covering all requested dates, then resolves
+    each date with an as-of lookup: the last rate at or before the date
+    within a 7-day window (weekends and holidays), else the first rate
+    on the following day.
     """
-    if from_currency.upper() == to_currency.upper():
-        return 1.0
-
-    start = target_date - datetime.timedelta(days=7)
-    end = target_date + datetime.timedelta(days=1)
-    series = _fetch_historical_fx_rate(from_currency, to_currency, start, end)
+    from_currency = from_currency.upper()
+    to_currency = to_currency.upper()
+    if from_currency == to_currency:
+        return {d: 1.0 for d in target_dates}
+
+    missing = sorted({
+        d for d in target_dates
+        if (from_currency, to_currency, d) not in _purchase_fx_cache
+    })
+    if missing:
+        series = _fetch_historical_fx_rate(
+            from_currency, to_currency,
+            missing[0] - datetime.timedelta(days=7),
+            missing[-1] + datetime.timedelta(days=1),
+        ).sort_index()
+        ordinals = np.array([d.toordinal() for d in series.index], dtype=int)
+        values = series.to_numpy(dtype=float)
+
+        for d in missing:
+            target = d.toordinal()
+            i = int(np.searchsorted(ordinals, target, side="right")) - 1
+            if i >= 0 and ordinals[i] >= target - 7:
+                rate = values[i]
+            elif i + 1 < len(ordinals) and ordinals[i + 1] <= target + 1:
+                rate = values[i + 1]
+            else:
+                raise ValueError(
+                    f"Cannot fetch FX rate for {from_currency}/{to_currency} "
+                    f"around {d}"
+                )
+            _purchase_fx_cache[(from_currency, to_currency, d)] = float(rate)
+
+    return {
+        d: _purchase_fx_cache[(from_currency, to_currency, d)]
+        for d in target_dates
+    }
 
-    if series.empty:
-        raise ValueError(
-            f"Cannot fetch FX rate for {from_currency}/{to_currency} "
-            f"around {target_date}"
-        )
 
-    valid = series[series.index <= target_date]
-    if valid.empty:
-        return float(series.iloc[0])
-    return float(valid.iloc[-1])
+def _get_fx_rate_on_date(
+    from_currency: str,
+    to_currency: str,
+    target_date: datetime.date,
+) -> float:
+    """Fetch the FX rate on a specific date (for fixed cost basis)."""
+    return _get_fx_rates_on_dates(from_currency, to_currency, [target_date])[target_date]
 
 
 # ---------------------------------------------------------------------------
@@ -160,6 +299,7 @@ class _Lot:
     price: float
     date: datetime.date
     currency: str
+    account: str = ""
     cost_basis_eur: float = 0.0  # pre-computed
 
 
@@ -173,6 +313,7 @@ def _build_lots(positions: list[dict], today: datetime.date) -> list[_Lot]:
     for pos in positions:
         ticker = pos["ticker"]
         currency = pos.get("currency", BASE_CURRENCY)
+        account = pos.get("account", "")
         raw_lots = pos.get("_lots")
 
         if raw_lots:
@@ -190,6 +331,7 @@ def _build_lots(positions: list[dict], today: datetime.date) -> list[_Lot]:
                     price=rl["price"],
                     date=lot_date,
                     currency=currency,
+                    account=account,
                 ))
         else:
             pd_str = pos.get("purchase_date")
@@ -205,11 +347,375 @@ def _build_lots(positions: list[dict], today: datetime.date) -> list[_Lot]:
                 price=pos["avg_price"],
                 date=lot_date,
                 currency=currency,
+                account=account,
             ))
 
     return lots
 
 
+# ---------------------------------------------------------------------------
+# Vectorized valuation
+# ---------------------------------------------------------------------------
+
+def _align_series(
+    series: pd.Series,
+    dates: pd.Index,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Forward-fill *series* onto *dates* (as-of lookup).
+
+    Returns ``(values, available)`` where *available* is False on dates
+    that precede the first observation of the series.
+    """
+    if series.empty:
+        return np.full(len(dates), np.nan), np.zeros(len(dates), dtype=bool)
+
+    series = series.sort_index(kind="stable")
+    series = series[~series.index.duplicated(keep="last")]
+    values = series.reindex(dates, method="ffill").to_numpy(dtype=float)
+    available = (
+        pd.Series(1.0, index=series.index)
+        .reindex(dates, method="ffill")
+        .notna()
+        .to_numpy()
+    )
+    return values, available
+
+
+def _value_lots(
+    lots: list[_Lot],
+    trading_dates: list[datetime.date],
+    price_series: dict[str, pd.Series],
+    fx_series: dict[str, pd.Series],
+) -> tuple[np.ndarray, np.ndarray, dict[tuple[str, str], tuple[np.ndarray, np.ndarray]]]:
+    """Value every lot on every trading date with array operations.
+
+    Price and FX series are aligned once on the shared date index and
+    forward-filled. A lot contributes to a date (value and cost basis)
+    only once it has been bought and both its price and FX rate are
+    known. Returns ``(value, cost_basis, by_position)`` where
+    *by_position* maps each (ticker, account) to its own
+    ``(value, cost_basis)`` arrays.
+    """
+    dates = pd.Index(trading_dates, dtype=object)
+    n = len(dates)
+
+    prices = {
+        ticker: _align_series(series, dates)
+        for ticker, series in price_series.items()
+    }
+    fx = {
+        ccy: _align_series(series, dates)
+        for ccy, series in fx_series.items()
+    }
+    ones = (np.ones(n), np.ones(n, dtype=bool))
+    missing = (np.full(n, np.nan), np.zeros(n, dtype=bool))
+    ordinals = np.array([d.toordinal() for d in trading_dates])
+
+    portfolio_value = np.zeros(n)
+    total_cost = np.zeros(n)
+    by_position: dict[tuple[str, str], tuple[np.ndarray, np.ndarray]] = {}
+
+    # Accumulate lot by lot (in order) so sums match a scalar loop exactly.
+    for lot in lots:
+        currency = lot.currency.upper()
+        close, has_price = prices.get(lot.ticker, missing)
+        if currency == BASE_CURRENCY.upper():
+            rate, has_rate = ones
+        else:
+            rate, has_rate = fx.get(currency, missing)
+
+        active = (ordinals >= lot.date.toordinal()) & has_price & has_rate
+        value = np.where(active, lot.qty * close * rate, 0.0)
+        cost = np.where(active, lot.cost_basis_eur, 0.0)
+        portfolio_value += value
+        total_cost += cost
+
+        position_value, position_cost = by_position.setdefault(
+            (lot.ticker, lot.account), (np.zeros(n), np.zeros(n)),
+        )
+        position_value += value
+        position_cost += cost
+
+    return portfolio_value, total_cost, by_position
+
+
+def _summarize(
+    dates: list[datetime.date],
+    portfolio_value: np.ndarray,
+    total_cost: np.ndarray,
+) -> list[DailyPerformance]:
+    """P&L and drawdown (from the first date's running peak) per date."""
+    pnl_eur = portfolio_value - total_cost
+    pnl_pct = (pnl_eur / total_cost) * 100
+
+    running_peak = np.fmax.accumulate(np.fmax(portfolio_value, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown_pct = np.where(
+            running_peak > 0,
+            (portfolio_value - running_peak) / running_peak * 100,
+            0.0,
+        )
+
+    return [
+        DailyPerformance(
+            date=date.isoformat(),
+            portfolio_value_eur=round(float(value), 2),
+            cost_basis_eur=round(float(cost), 2),
+            pnl_eur=round(float(pnl), 2),
+            pnl_pct=round(float(pct), 2),
+            drawdown_pct=round(float(dd), 2),
+        )
+        for date, value, cost, pnl, pct, dd in zip(
+            dates, portfolio_value, total_cost, pnl_eur, pnl_pct, drawdown_pct
+        )
+    ]
+
+
+def _compute_daily(
+    lots: list[_Lot],
+    trading_dates: list[datetime.date],
+    price_series: dict[str, pd.Series],
+    fx_series: dict[str, pd.Series],
+) -> list[DailyPerformance]:
+    """Daily performance of *lots* over *trading_dates*.
+
+    Dates with no contributing lot are dropped.
+    """
+    portfolio_value, total_cost, _ = _value_lots(lots, trading_dates, price_series, fx_series)
+    keep = total_cost != 0
+    kept_dates = np.array(trading_dates, dtype=object)[keep]
+    return _summarize(list(kept_dates), portfolio_value[keep], total_cost[keep])
+
+
+def _apply_cost_basis(lots: list[_Lot]) -> None:
+    """Set each lot's cost basis in EUR at its purchase-date FX rate."""
+    # One FX series per currency, then an in-memory as-of lookup per lot.
+    lot_dates_by_ccy: dict[str, list[datetime.date]] = {}
+    for lot in lots:
+        lot_dates_by_ccy.setdefault(lot.currency.upper(), []).append(lot.date)
+    purchase_fx = {
+        ccy: _get_fx_rates_on_dates(ccy, BASE_CURRENCY, dates)
+        for ccy, dates in lot_dates_by_ccy.items()
+    }
+    for lot in lots:
+        fx_at_purchase = purchase_fx[lot.currency.upper()][lot.date]
+        lot.cost_basis_eur = lot.qty * lot.price * fx_at_purchase
+
+
+def _fetch_series(
+    currencies: dict[str, str],
+    start: datetime.date,
+    end: datetime.date,
+) -> tuple[dict[str, pd.Series], dict[str, pd.Series]]:
+    """Price series per ticker and FX series per non-EUR currency, concurrently.
+
+    *currencies* maps each ticker to its quote currency.
+    """
+    tickers = sorted(currencies)
+    currencies_needed = sorted({
+        ccy.upper()
+        for ccy in currencies.values()
+        if ccy.upper() != BASE_CURRENCY.upper()
+    })
+
+    def fetch_series(key: tuple[str, str]) -> pd.Series:
+        kind, symbol = key
+        if kind == "price":
+            return _fetch_historical_prices(symbol, start, end)
+        return _fetch_historical_fx_rate(symbol, BASE_CURRENCY, start, end)
+
+    fetched, _ = map_bounded(
+        fetch_series,
+        [("price", t) for t in tickers] + [("fx", c) for c in currencies_needed],
+        max_workers=HISTORY_MAX_WORKERS,
+    )
+    empty = pd.Series(dtype=float)
+    price_series = {t: fetched.get(("price", t), empty) for t in tickers}
+    fx_series = {c: fetched.get(("fx", c), empty) for c in currencies_needed}
+    return price_series, fx_series
+
+
+def eur_price_matrix(
+    currencies: dict[str, str],
+    start: datetime.date,
+    end: datetime.date,
+) -> tuple[list[datetime.date], np.ndarray]:
+    """Daily closes in EUR, one row per ticker of *currencies* (in order).
+
+    Served from the same price store as the performance history.
+    Columns are the union of the tickers' trading dates between *start*
+    and *end*. Prices and FX rates are forward-filled, and a row is NaN
+    before the ticker's first close.
+    """
+    price_series, fx_series = _fetch_series(currencies, start, end)
+    all_dates: set[datetime.date] = set()
+    for s in price_series.values():
+        all_dates.update(s.index)
+    trading_dates = sorted(d for d in all_dates if start <= d <= end)
+    dates = pd.Index(trading_dates, dtype=object)
+
+    matrix = np.full((len(currencies), len(trading_dates)), np.nan)
+    for i, (ticker, currency) in enumerate(currencies.items()):
+        close, _ = _align_series(price_series[ticker], dates)
+        if currency.upper() != BASE_CURRENCY.upper():
+            rate, _ = _align_series(fx_series[currency.upper()], dates)
+            close = close * rate
+        matrix[i] = close
+    return trading_dates, matrix
+
+
+# ---------------------------------------------------------------------------
+# Materialized NAV
+# ---------------------------------------------------------------------------
+
+def _lot_key(lot: _Lot) -> tuple[str, str, datetime.date, float, float, str]:
+    return (
+        lot.ticker, lot.account, lot.date, float(lot.qty), float(lot.price), lot.currency.upper(),
+    )
+
+
+def _valuation_rows(
+    lots: list[_Lot],
+    start: datetime.date,
+    end: datetime.date,
+) -> tuple[list[dict], list[dict], list[_Lot]]:
+    """NAV and per-position contribution rows for trading dates in [start, end].
+
+    Also returns the lots actually valued: a lot whose price or FX
+    series came back empty (failed download) is left out of the rows.
+    """
+    _apply_cost_basis(lots)
+    currencies = {lot.ticker: lot.currency for lot in lots}
+    # Look back a few days so prices forward-fill onto *start*.
+    price_series, fx_series = _fetch_series(
+        currencies, start - datetime.timedelta(days=NAV_LOOKBACK_DAYS), end,
+    )
+
+    def priced(lot: _Lot) -> bool:
+        return not price_series[lot.ticker].empty and (
+            lot.currency.upper() == BASE_CURRENCY.upper()
+            or not fx_series[lot.currency.upper()].empty
+        )
+
+    # A ticker without a close in that window (suspended, illiquid) is
+    # forward-filled from its last close since its first lot instead.
+    unpriced = [lot for lot in lots if not priced(lot)]
+    if unpriced:
+        wider_prices, wider_fx = _fetch_series(
+            {lot.ticker: lot.currency for lot in unpriced},
+            min(lot.date for lot in unpriced) - datetime.timedelta(days=NAV_LOOKBACK_DAYS),
+            end,
+        )
+        price_series.update((t, s) for t, s in wider_prices.items() if price_series[t].empty)
+        fx_series.update((c, s) for c, s in wider_fx.items() if fx_series[c].empty)
+    valued = [lot for lot in lots if priced(lot)]
+
+    all_dates: set[datetime.date] = set()
+    for s in price_series.values():
+        all_dates.update(s.index)
+    trading_dates = sorted(d for d in all_dates if start <= d <= end)
+    if not trading_dates:
+        return [], [], valued
+
+    value, cost, by_position = _value_lots(valued, trading_dates, price_series, fx_series)
+    nav = [
+        {"date": d, "value_eur": float(v), "cost_basis_eur": float(c)}
+        for d, v, c in zip(trading_dates, value, cost)
+        if c != 0
+    ]
+    contributions = [
+        {
+            "date": d, "ticker": ticker, "account": account,
+            "value_eur": float(v), "cost_basis_eur": float(c),
+        }
+        for (ticker, account), (position_value, position_cost) in sorted(by_position.items())
+        for d, v, c in zip(trading_dates, position_value, position_cost)
+        if c != 0
+    ]
+    return nav, contributions, valued
+
+
+def _refresh_nav(lots: list[_Lot], today: datetime.date) -> dict:
+    global _nav_synced, _nav_generation
+    from app import nav_store  # imported here: the valuation code needs no database
+
+    keys = [_lot_key(lot) for lot in lots]
+    changed = nav_store.first_changed_date(keys)
+    last = nav_store.last_date()
+    if last is None:
+        start = min((lot.date for lot in lots), default=today)
+    elif changed is not None:
+        start = min(last, changed)
+    else:
+        start = last  # its close may have been provisional
+
+    nav, contributions, valued = _valuation_rows(lots, start, today) if lots else ([], [], [])
+    # Lots left out are not recorded, so the next refresh sees them as
+    # new and retries from their date instead of leaving a gap.
+    nav_store.replace_from(start, nav, contributions, [_lot_key(lot) for lot in valued])
+    _nav_generation += 1
+    _nav_synced = (sorted(keys), time.monotonic())
+    return {"from": start.isoformat(), "days": len(nav), "missing": len(lots) - len(valued)}
+
+
+def refresh_nav(positions: list[dict]) -> dict:
+    """Bring the materialized daily NAV up to date.
+
+    Recomputes from the first date affected by a lot change (e.g. a
+    back-dated transaction), else from the last stored day, so keeping
+    the history current costs one or two days of valuation. Lots whose
+    prices could not be fetched are retried from their date on the next
+    refresh. Returns ``{"from": "YYYY-MM-DD", "days": n, "missing": n}``
+    (days rewritten, lots left out).
+    """
+    today = datetime.date.today()
+    with _nav_lock:
+        return _refresh_nav(_build_lots(positions, today), today)
+
+
+def _ensure_nav(lots: list[_Lot], today: datetime.date) -> None:
+    """Refresh the NAV if the lots changed or it was last synced too long ago."""
+    keys = sorted(_lot_key(lot) for lot in lots)
+
+    def fresh() -> bool:
+        return (
+            _nav_synced is not None
+            and _nav_synced[0] == keys
+            and time.monotonic() - _nav_synced[1] < NAV_REFRESH_SECONDS
+        )
+
+    if fresh():
+        return
+    with _nav_lock:
+        if not fresh():
+            _refresh_nav(lots, today)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def _full_series(earliest: datetime.date, today: datetime.date) -> _SeriesCache:
+    """The whole stored history, read once per NAV generation and day."""
+    global _series_cache
+    from app import nav_store
+
+    key = (_nav_generation, today)
+    cache = _series_cache
+    if cache is None or cache.key != key:
+        rows = nav_store.load_nav(earliest, today)
+        dates = [row[0] for row in rows]
+        cache = _SeriesCache(
+            key=key,
+            ordinals=np.array([d.toordinal() for d in dates], dtype=int),
+            dates=dates,
+            values=np.array([row[1] for row in rows], dtype=float),
+            costs=np.array([row[2] for row in rows], dtype=float),
+        )
+        _series_cache = cache
+    return cache
+
+
 def compute_performance(
     positions: list[dict],
     period: str = "ALL",
@@ -228,7 +734,11 @@ def compute_performance(
     Returns
     -------
     PerformanceResult
-        Daily performance snapshots with P&L % and drawdown %.
+        Daily performance snapshots with P&L % and drawdown %. Every
+        period is a slice of the full stored history, read once per
+        version of the materialized NAV; peak and drawdown are
+        recomputed on the slice. Results are shared between callers
+        and must not be mutated.
     """
     today = datetime.date.today()
 
@@ -241,101 +751,164 @@ def compute_performance(
     start = _resolve_start_date(period, earliest, today)
     end = today
 
-    # --- Pre-compute cost basis EUR for each lot ---
-    for lot in lots:
-        fx_at_purchase = _get_fx_rate_on_date(lot.currency, BASE_CURRENCY, lot.date)
-        lot.cost_basis_eur = lot.qty * lot.price * fx_at_purchase
+    _ensure_nav(lots, today)
+    series = _full_series(earliest, today)
+    result = series.results.get(period)
+    if result is not None:
+        return result
 
-    # --- Fetch historical price series for each unique ticker ---
-    tickers = {lot.ticker for lot in lots}
-    price_series: dict[str, pd.Series] = {}
-    for ticker in tickers:
-        price_series[ticker] = _fetch_historical_prices(ticker, start, end)
-
-    # --- Fetch historical FX rates for non-EUR currencies ---
-    currencies_needed = {
-        lot.currency.upper()
-        for lot in lots
-        if lot.currency.upper() != BASE_CURRENCY.upper()
-    }
-    fx_series: dict[str, pd.Series] = {}
-    for ccy in currencies_needed:
-        fx_series[ccy] = _fetch_historical_fx_rate(ccy, BASE_CURRENCY, start, end)
+    i = int(np.searchsorted(series.ordinals, start.toordinal(), side="left"))
+    result = PerformanceResult(
+        daily=_summarize(series.dates[i:], series.values[i:], series.costs[i:]),
+        period=period,
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+    )
+    series.results[period] = result
+    return result
 
-    # --- Build union of all trading dates ---
-    all_dates: set[datetime.date] = set()
-    for s in price_series.values():
-        all_dates.update(s.index)
-    trading_dates = sorted(d for d in all_dates if d >= start)
 
-    if not trading_dates:
-        return PerformanceResult(
-            period=period,
-            start_date=start.isoformat(),
-            end_date=end.isoformat(),
-        )
+# ---------------------------------------------------------------------------
+# Returns (TWR / MWR)
+# ---------------------------------------------------------------------------
 
-    # --- Compute daily portfolio value and drawdown ---
-    daily_results: list[DailyPerformance] = []
-    running_peak = 0.0
+def _views_series(earliest: datetime.date, today: datetime.date) -> _ViewsCache:
+    """Per-view value and cash-flow matrices, built once per NAV version.
 
-    for date in trading_dates:
-        portfolio_value = 0.0
-        total_cost = 0.0
+    Cash flows are the day-over-day changes of the stored cost basis:
+    it only moves when a lot starts counting in the valuation, by that
+    lot's cost at its purchase-date FX rate.
+    """
+    global _views_cache
+    from app import nav_store
+
+    key = (_nav_generation, today)
+    cache = _views_cache
+    if cache is not None and cache.key == key:
+        return cache
+
+    rows = nav_store.load_contributions(earliest, today)
+    dates = sorted({row[0] for row in rows})
+    positions = sorted({(row[1], row[2]) for row in rows})
+    date_index = {d: i for i, d in enumerate(dates)}
+    position_index = {p: i for i, p in enumerate(positions)}
+
+    values = np.zeros((len(positions), len(dates)))
+    costs = np.zeros((len(positions), len(dates)))
+    for d, ticker, account, value, cost in rows:
+        i, j = position_index[(ticker, account)], date_index[d]
+        values[i, j] = value
+        costs[i, j] = cost
+
+    # Group positions into views with a 0/1 matrix: one product per matrix.
+    views = (
+        [("portfolio", "")]
+        + [("account", a) for a in sorted({a for _, a in positions})]
+        + [("ticker", t) for t in sorted({t for t, _ in positions})]
+    )
+    groups = np.zeros((len(views), len(positions)))
+    groups[0, :] = 1.0
+    view_index = {v: i for i, v in enumerate(views)}
+    for k, (ticker, account) in enumerate(positions):
+        groups[view_index[("account", account)], k] = 1.0
+        groups[view_index[("ticker", ticker)], k] = 1.0
+
+    view_costs = groups @ costs
+    cache = _ViewsCache(
+        key=key,
+        ordinals=np.array([d.toordinal() for d in dates], dtype=int),
+        views=views,
+        values=groups @ values,
+        flows=np.diff(view_costs, axis=1, prepend=0.0),
+    )
+    _views_cache = cache
+    return cache
 
-        for lot in lots:
-            # Only include lots that are active on this date
-            if date < lot.date:
-                continue
 
-            currency = lot.currency.upper()
+def _pct(value: float) -> float | None:
+    return round(float(value) * 100, 2) if np.isfinite(value) else None
 
-            # Get price (forward-fill from last available)
-            prices = price_series.get(lot.ticker, pd.Series(dtype=float))
-            available = prices[prices.index <= date]
-            if available.empty:
-                continue
-            close_price = float(available.iloc[-1])
 
-            # Get FX rate (forward-fill)
-            if currency == BASE_CURRENCY.upper():
-                fx_rate = 1.0
-            else:
-                fx = fx_series.get(currency, pd.Series(dtype=float))
-                fx_available = fx[fx.index <= date]
-                if fx_available.empty:
-                    continue
-                fx_rate = float(fx_available.iloc[-1])
-
-            portfolio_value += lot.qty * close_price * fx_rate
-            total_cost += lot.cost_basis_eur
-
-        if total_cost == 0:
-            continue
-
-        pnl_eur = portfolio_value - total_cost
-        pnl_pct = (pnl_eur / total_cost) * 100
-
-        if portfolio_value > running_peak:
-            running_peak = portfolio_value
-        drawdown_pct = (
-            (portfolio_value - running_peak) / running_peak * 100
-            if running_peak > 0
-            else 0.0
+def compute_returns(
+    positions: list[dict],
+    period: str = "ALL",
+) -> ReturnsResult:
+    """Time- and money-weighted returns over the selected period.
+
+    Computed for the whole portfolio, each account and each ticker at
+    once, from the materialized NAV. The TWR chain-links daily returns
+    around the purchase cash flows. The MWR is the XIRR of those cash
+    flows. For a shorter period, the value held at its start counts as
+    the initial investment. Results are memoized per NAV version and
+    period, and are shared between callers, so they must not be mutated.
+    """
+    today = datetime.date.today()
+    lots = _build_lots(positions, today)
+    if not lots:
+        return ReturnsResult(period=period)
+
+    earliest = min(l.date for l in lots)
+    start = _resolve_start_date(period, earliest, today)
+
+    _ensure_nav(lots, today)
+    series = _views_series(earliest, today)
+    result = series.results.get(period)
+    if result is not None:
+        return result
+
+    result = ReturnsResult(period=period, start_date=start.isoformat(), end_date=today.isoformat())
+    i = int(np.searchsorted(series.ordinals, start.toordinal(), side="left"))
+    if i >= len(series.ordinals):
+        series.results[period] = result
+        return result
+
+    ordinals = series.ordinals[i:]
+    values = series.values[:, i:]
+    flows = series.flows[:, i:]
+    start_values = series.values[:, i - 1] if i > 0 else np.zeros(len(series.views))
+    # Each view over its own holding days (from its first investment).
+    days = returns.holding_days(ordinals, flows, start_values)
+
+    twr = returns.time_weighted_returns(values, flows, start_values)
+    mwr = returns.money_weighted_returns(ordinals, values, flows, start_values)
+    long_enough = days >= returns.DAYS_PER_YEAR  # False for NaN
+    twr_annualized = returns.annualize(twr, days)
+    mwr_annualized = returns.annualize(mwr, days)
+    invested = start_values + flows.sum(axis=1)
+
+    for k, (kind, name) in enumerate(series.views):
+        if invested[k] == 0 and values[k, -1] == 0:
+            continue  # not held during the period
+        metrics = ReturnMetrics(
+            value_eur=round(float(values[k, -1]), 2),
+            invested_eur=round(float(invested[k]), 2),
+            twr_pct=_pct(twr[k]),
+            mwr_pct=_pct(mwr[k]),
+            twr_annualized_pct=_pct(twr_annualized[k]) if long_enough[k] else None,
+            mwr_annualized_pct=_pct(mwr_annualized[k]) if long_enough[k] else None,
         )
+        if kind == "portfolio":
+            result.portfolio = metrics
+        elif kind == "account":
+            result.accounts[name] = metrics
+        else:
+            result.tickers[name] = metrics
 
-        daily_results.append(DailyPerformance(
-            date=date.isoformat(),
-            portfolio_value_eur=round(portfolio_value, 2),
-            cost_basis_eur=round(total_cost, 2),
-            pnl_eur=round(pnl_eur, 2),
-            pnl_pct=round(pnl_pct, 2),
-            drawdown_pct=round(drawdown_pct, 2),
-        ))
-
-    return PerformanceResult(
-        daily=daily_results,
-        period=period,
-        start_date=start.isoformat(),
-        end_date=end.isoformat(),
-    )
+    series.results[period] = result
+    return result
+
+
+async def compute_returns_async(
+    positions: list[dict],
+    period: str = "ALL",
+) -> ReturnsResult:
+    """Async variant of :func:`compute_returns` (runs in a worker thread)."""
+    return await asyncio.to_thread(compute_returns, positions, period)
+
+
+async def compute_performance_async(
+    positions: list[dict],
+    period: str = "ALL",
+) -> PerformanceResult:
+    """Async variant of :func:`compute_performance` (runs in a worker thread)."""
+    return await asyncio.to_thread(compute_performance, positions, period)
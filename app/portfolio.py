@@ -1,24 +1,32 @@
-import os
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
-import yaml
 import yfinance as yf
 
-from app.config import BASE_CURRENCY, PORTFOLIO_PATH, TRANSACTIONS_PATH
+from app.config import (
+    BASE_CURRENCY,
+    PORTFOLIO_PATH,
+    QUOTE_CACHE_MAX_SIZE,
+    QUOTE_CACHE_TTL_SECONDS,
+    TRANSACTIONS_PATH,
+)
+from app.config_registry import load_yaml
 from app.forex import convert
 
 
 def load_portfolio() -> list[dict]:
-    with open(PORTFOLIO_PATH, "r") as f:
-        data = yaml.safe_load(f)
+    data = load_yaml(PORTFOLIO_PATH)
+    if data is None:
+        raise FileNotFoundError(PORTFOLIO_PATH)
     return data.get("positions", [])
 
 
 def load_transactions() -> list[dict]:
     """Load additional buy transactions from transactions.yaml."""
-    if not os.path.exists(TRANSACTIONS_PATH):
-        return []
-    with open(TRANSACTIONS_PATH, "r") as f:
-        data = yaml.safe_load(f) or {}
+    data = load_yaml(TRANSACTIONS_PATH) or {}
     return data.get("transactions", []) or []
 
 
@@ -93,22 +101,225 @@ def aggregate_positions(
     return result
 
 
-def fetch_current_prices(tickers: list[str]) -> dict[str, float | None]:
-    prices = {}
-    for ticker in tickers:
+QUOTE_MAX_WORKERS = 8
+
+
+class _QuoteCache:
+    """Thread-safe TTL cache of live quotes, shared by all endpoints.
+
+    Bounded to *max_size* tickers (least recently used evicted first).
+    Concurrent lookups of a ticker already being fetched wait on the
+    in-flight request instead of starting a new upstream call.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def lookup(self, ticker: str, force: bool = False) -> tuple[str, float | Future]:
+        """Return ``("hit", price)``, ``("wait", future)`` or ``("fetch", future)``.
+
+        The caller receiving ``"fetch"`` owns the upstream request and must
+        call :meth:`resolve` with its outcome. With *force*, a fresh entry
+        is not returned as a hit (the quote is fetched again).
+        """
+        with self._lock:
+            entry = self._entries.get(ticker)
+            fresh = entry is not None and time.monotonic() - entry[0] < self.ttl_seconds
+            if fresh and not force:
+                self._entries.move_to_end(ticker)
+                self.hits += 1
+                return "hit", entry[1]
+            future = self._inflight.get(ticker)
+            if future is not None:
+                self.coalesced += 1
+                return "wait", future
+            future = Future()
+            self._inflight[ticker] = future
+            self.misses += 1
+            return "fetch", future
+
+    def resolve(
+        self,
+        ticker: str,
+        price: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Publish the outcome of an upstream fetch to the cache and waiters."""
+        with self._lock:
+            future = self._inflight.pop(ticker)
+            if error is None and price is not None:
+                self._entries[ticker] = (time.monotonic(), price)
+                self._entries.move_to_end(ticker)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(price)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.coalesced = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_quote_cache = _QuoteCache(QUOTE_CACHE_TTL_SECONDS, QUOTE_CACHE_MAX_SIZE)
+
+
+def quote_cache_stats() -> dict:
+    """Hit/miss counters and occupancy of the shared quote cache."""
+    return _quote_cache.stats()
+
+
+def clear_quote_cache() -> None:
+    """Drop all cached quotes and reset counters."""
+    _quote_cache.clear()
+
+
+def _fetch_quote(ticker: str) -> float | None:
+    """Fetch the latest price for a single ticker (raises on failure)."""
+    info = yf.Ticker(ticker).fast_info
+    return info.get("lastPrice") or info.get("previousClose")
+
+
+def _fetch_and_resolve(ticker: str) -> None:
+    try:
+        price = _fetch_quote(ticker)
+    except Exception as e:
+        _quote_cache.resolve(ticker, error=e)
+    else:
+        _quote_cache.resolve(ticker, price=price)
+
+
+def fetch_quotes(
+    tickers: list[str],
+    force: bool = False,
+) -> tuple[dict[str, float | None], dict[str, str]]:
+    """Fetch latest prices for *tickers* in parallel (bounded thread pool).
+
+    Quotes are served from the shared TTL cache when fresh; only missing
+    tickers hit upstream, and a ticker already being fetched by another
+    request is awaited rather than fetched twice. *force* re-fetches
+    cached quotes too (used to refresh the cache before it expires).
+
+    Returns ``(prices, errors)``: every requested ticker is present in
+    *prices* (``None`` when unavailable) and failed tickers are listed in
+    *errors* with the exception message. Latency is that of the slowest
+    quote rather than the sum of all of them.
+    """
+    prices: dict[str, float | None] = {}
+    errors: dict[str, str] = {}
+    pending: dict[str, Future] = {}
+    to_fetch: list[str] = []
+
+    _claim_quotes(tickers, prices, pending, to_fetch, force)
+
+    if to_fetch:
+        workers = min(QUOTE_MAX_WORKERS, len(to_fetch))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for ticker in to_fetch:
+                pool.submit(_fetch_and_resolve, ticker)
+
+    for ticker, future in pending.items():
+        try:
+            prices[ticker] = future.result()
+        except Exception as e:
+            prices[ticker] = None
+            errors[ticker] = str(e) or type(e).__name__
+    return prices, errors
+
+
+async def fetch_quotes_async(
+    tickers: list[str],
+) -> tuple[dict[str, float | None], dict[str, str]]:
+    """Async variant of :func:`fetch_quotes` (same cache, same results).
+
+    Blocking yfinance calls run in worker threads (at most
+    ``QUOTE_MAX_WORKERS`` at once) while the event loop stays free.
+    """
+    prices: dict[str, float | None] = {}
+    errors: dict[str, str] = {}
+    pending: dict[str, Future] = {}
+    to_fetch: list[str] = []
+
+    _claim_quotes(tickers, prices, pending, to_fetch)
+
+    limiter = asyncio.Semaphore(QUOTE_MAX_WORKERS)
+
+    async def fetch(ticker: str) -> None:
+        async with limiter:
+            await asyncio.to_thread(_fetch_and_resolve, ticker)
+
+    await asyncio.gather(*(fetch(t) for t in to_fetch))
+
+    for ticker, future in pending.items():
         try:
-            t = yf.Ticker(ticker)
-            info = t.fast_info
-            prices[ticker] = info.get("lastPrice") or info.get("previousClose")
-        except Exception:
+            prices[ticker] = await asyncio.wrap_future(future)
+        except Exception as e:
             prices[ticker] = None
+            errors[ticker] = str(e) or type(e).__name__
+    return prices, errors
+
+
+def _claim_quotes(
+    tickers: list[str],
+    prices: dict[str, float | None],
+    pending: dict[str, Future],
+    to_fetch: list[str],
+    force: bool = False,
+) -> None:
+    """Split *tickers* into cache hits (*prices*), awaited futures
+    (*pending*) and the tickers this caller must fetch (*to_fetch*)."""
+    for ticker in dict.fromkeys(tickers):
+        status, value = _quote_cache.lookup(ticker, force)
+        if status == "hit":
+            prices[ticker] = value
+        else:
+            pending[ticker] = value
+            if status == "fetch":
+                to_fetch.append(ticker)
+
+
+def fetch_current_prices(tickers: list[str]) -> dict[str, float | None]:
+    prices, _ = fetch_quotes(tickers)
     return prices
 
 
 def enrich_positions(positions: list[dict]) -> list[dict]:
     tickers = [p["ticker"] for p in positions]
     prices = fetch_current_prices(tickers)
+    return _price_positions(positions, prices)
+
 
+async def enrich_positions_async(positions: list[dict]) -> list[dict]:
+    """Async variant of :func:`enrich_positions`."""
+    prices, _ = await fetch_quotes_async([p["ticker"] for p in positions])
+    # FX conversion may hit yfinance on first use of a currency pair.
+    return await asyncio.to_thread(_price_positions, positions, prices)
+
+
+def _price_positions(
+    positions: list[dict], prices: dict[str, float | None],
+) -> list[dict]:
+    """Compute market value, cost basis and P&L from live *prices*."""
     enriched = []
     for pos in positions:
         ticker = pos["ticker"]
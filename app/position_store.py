@@ -0,0 +1,123 @@
+"""Incremental persistence of enriched positions to the database.
+
+This module is self-contained: it depends only on SQLAlchemy and the
+``positions`` model, so it can be reused by any script that needs to
+save a priced portfolio.
+
+Rows are keyed by (ticker, account). Each save reads the stored rows
+once, diffs them against the new snapshot and writes only what changed:
+new and modified positions in one bulk ``INSERT ... ON CONFLICT DO
+UPDATE`` statement, positions no longer held in one ``DELETE``. An
+unchanged portfolio costs a single SELECT and no write. Saves are
+serialized, so concurrent callers never interleave their diffs.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.database import SessionLocal
+from app.models import Position
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+KEY_FIELDS = ("ticker", "account")
+FIELDS = tuple(
+    column.name for column in Position.__table__.columns
+    if column.name not in ("id", "updated_at")
+)
+
+_save_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+def _key(row: dict) -> tuple:
+    return tuple(row[f] for f in KEY_FIELDS)
+
+
+def diff_positions(stored: dict[tuple, dict], positions: list[dict]) -> tuple[list[dict], list[tuple]]:
+    """Return (rows to upsert, keys to delete) to turn *stored* into *positions*.
+
+    *stored* maps (ticker, account) to the stored column values. Extra
+    keys of *positions* that are not table columns are ignored.
+    """
+    rows = {}
+    for pos in positions:
+        row = {f: pos.get(f) for f in FIELDS}
+        rows[_key(row)] = row
+    changed = [row for key, row in rows.items() if stored.get(key) != row]
+    stale = [key for key in stored if key not in rows]
+    return changed, stale
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+def _upsert(db: Session, rows: list[dict]) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        # No portable upsert: update existing rows, insert the others.
+        for row in rows:
+            result = db.execute(
+                update(Position)
+                .where(tuple_(Position.ticker, Position.account) == _key(row))
+                .values(**row)
+            )
+            if result.rowcount == 0:
+                db.add(Position(**row))
+        return
+
+    stmt = insert(Position).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(KEY_FIELDS),
+        set_={
+            **{f: stmt.excluded[f] for f in FIELDS if f not in KEY_FIELDS},
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def save_positions(
+    positions: list[dict],
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> dict:
+    """Persist a priced snapshot, writing only rows that changed.
+
+    Opens its own session, so it can run after the request that
+    produced *positions* has returned. Returns
+    ``{"upserted": n, "deleted": n}``.
+    """
+    with _save_lock, session_factory() as db:
+        columns = [getattr(Position, f) for f in FIELDS]
+        stored = {
+            _key(row): row
+            for row in (dict(r._mapping) for r in db.execute(select(*columns)))
+        }
+        changed, stale = diff_positions(stored, positions)
+        if changed:
+            _upsert(db, changed)
+        if stale:
+            db.execute(
+                delete(Position)
+                .where(tuple_(Position.ticker, Position.account).in_(stale))
+            )
+        if changed or stale:
+            db.commit()
+    return {"upserted": len(changed), "deleted": len(stale)}
@@ -0,0 +1,208 @@
+"""Persistent local store of daily close prices.
+
+This module is self-contained: it depends only on pandas and the
+standard library (sqlite3), so it can be reused by any script that
+needs cached historical prices.
+
+Closes are kept per symbol in a SQLite file under the data directory,
+together with the contiguous date range already covered for that
+symbol. Past closes never change, so once a range is stored only the
+missing head or tail is requested from upstream. The last stored days
+are re-fetched at most every ``TAIL_REFRESH_SECONDS`` since today's
+close is provisional until the market shuts. When upstream is
+unreachable, whatever is stored is returned (offline mode).
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Callable
+
+import pandas as pd
+
+from app.config import DATA_DIR
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+PRICE_STORE_PATH = os.path.join(DATA_DIR, "prices.sqlite")
+TAIL_REFRESH_SECONDS = 15 * 60  # 15 minutes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS closes (
+    symbol TEXT NOT NULL,
+    date   TEXT NOT NULL,
+    close  REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol     TEXT PRIMARY KEY,
+    first_date TEXT NOT NULL,
+    last_date  TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Fetches closes for (symbol, start, end). Must raise on failure; an
+# empty Series means "no data in that range" and is recorded as covered.
+Fetcher = Callable[[str, datetime.date, datetime.date], pd.Series]
+
+_init_lock = threading.Lock()
+_initialized_paths: set[str] = set()
+
+
+# ---------------------------------------------------------------------------
+# Storage helpers
+# ---------------------------------------------------------------------------
+
+def _connect(path: str) -> sqlite3.Connection:
+    if path not in _initialized_paths:
+        with _init_lock:
+            if path not in _initialized_paths:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with closing(sqlite3.connect(path)) as conn:
+                    conn.executescript(_SCHEMA)
+                _initialized_paths.add(path)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _get_coverage(
+    conn: sqlite3.Connection, symbol: str,
+) -> tuple[datetime.date, datetime.date, float] | None:
+    row = conn.execute(
+        "SELECT first_date, last_date, fetched_at FROM coverage WHERE symbol = ?",
+        (symbol,),
+    ).fetchone()
+    if row is None:
+        return None
+    return (
+        datetime.date.fromisoformat(row[0]),
+        datetime.date.fromisoformat(row[1]),
+        row[2],
+    )
+
+
+def _write(
+    conn: sqlite3.Connection,
+    symbol: str,
+    series: pd.Series,
+    first: datetime.date,
+    last: datetime.date,
+    fetched_at: float,
+) -> None:
+    rows = [
+        (symbol, d.isoformat(), None if pd.isna(v) else float(v))
+        for d, v in series.items()
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO closes (symbol, date, close) VALUES (?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO coverage (symbol, first_date, last_date, fetched_at) "
+            "VALUES (?, ?, ?, ?)",
+            (symbol, first.isoformat(), last.isoformat(), fetched_at),
+        )
+
+
+def _last_close(conn: sqlite3.Connection, symbol: str) -> datetime.date | None:
+    row = conn.execute(
+        "SELECT MAX(date) FROM closes WHERE symbol = ? AND close IS NOT NULL", (symbol,),
+    ).fetchone()
+    return datetime.date.fromisoformat(row[0]) if row[0] else None
+
+
+def _read(
+    conn: sqlite3.Connection,
+    symbol: str,
+    start: datetime.date,
+    end: datetime.date,
+) -> pd.Series:
+    rows = conn.execute(
+        "SELECT date, close FROM closes WHERE symbol = ? AND date >= ? AND date <= ? "
+        "ORDER BY date",
+        (symbol, start.isoformat(), end.isoformat()),
+    ).fetchall()
+    if not rows:
+        return pd.Series(dtype=float)
+    return pd.Series(
+        [r[1] for r in rows],
+        index=[datetime.date.fromisoformat(r[0]) for r in rows],
+        dtype=float,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def load_closes(
+    symbol: str,
+    start: datetime.date,
+    end: datetime.date,
+    fetch: Fetcher,
+    path: str = PRICE_STORE_PATH,
+) -> pd.Series:
+    """Return daily closes for *symbol* between *start* and *end* (inclusive).
+
+    Only the part of the range not yet stored is requested through
+    *fetch*. A range upstream has no rows for (empty Series) is recorded
+    as covered, so it is not requested again. Upstream failures are
+    swallowed: the stored data is returned as-is and the missing range
+    is retried on the next call.
+
+    Returns a pandas Series indexed by ``datetime.date``, sorted.
+    """
+    today = datetime.date.today()
+    now = time.time()
+
+    with closing(_connect(path)) as conn:
+        coverage = _get_coverage(conn, symbol)
+
+        if coverage is None:
+            try:
+                series = fetch(symbol, start, end)
+            except Exception:
+                return pd.Series(dtype=float)
+            _write(conn, symbol, series, start, end, now)
+            return _read(conn, symbol, start, end)
+
+        first, last, fetched_at = coverage
+
+        if start < first:
+            try:
+                head = fetch(symbol, start, first - datetime.timedelta(days=1))
+                _write(conn, symbol, head, start, last, fetched_at)
+                first = start
+            except Exception:
+                pass
+
+        tail_stale = last >= today and now - fetched_at >= TAIL_REFRESH_SECONDS
+        if end > last or (end >= today and tail_stale):
+            # Re-fetch from the last stored close: it may be provisional, and
+            # days covered by an empty answer since then are checked again.
+            tail_start = min(_last_close(conn, symbol) or last, today)
+            try:
+                tail = fetch(symbol, tail_start, max(end, last))
+                _write(conn, symbol, tail, first, max(end, last), now)
+            except Exception:
+                pass
+
+        return _read(conn, symbol, start, end)
+
+
+def clear_symbol(symbol: str, path: str = PRICE_STORE_PATH) -> None:
+    """Forget everything stored for *symbol* (forces a full re-download)."""
+    with closing(_connect(path)) as conn, conn:
+        conn.execute("DELETE FROM closes WHERE symbol = ?", (symbol,))
+        conn.execute("DELETE FROM coverage WHERE symbol = ?", (symbol,))
@@ -0,0 +1,187 @@
+"""Time-weighted and money-weighted returns of daily valuation series.
+
+This module is self-contained: it depends only on numpy, so it can be
+reused by any script that has daily values and cash flows.
+
+Every function works on a matrix with one row per series (portfolio,
+account, ticker, ...) and one column per date, so all series are
+computed in a single pass of array operations.
+
+- The time-weighted return (TWR) chain-links daily returns. Each day's
+  cash flow is invested at the start of the day:
+  ``r_t = V_t / (V_{t-1} + F_t) - 1``. New contributions therefore do
+  not count as performance.
+- The money-weighted return (MWR) is the internal rate of return of
+  the dated cash flows (XIRR). It is solved by Newton's method, with a
+  bisection fallback for the rows that do not converge.
+
+A series only counts from its first investment: a ticker bought late in
+the period is measured (and annualized) over its own holding days.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DAYS_PER_YEAR = 365.0
+
+XIRR_GUESS = 0.1
+XIRR_TOLERANCE = 1e-10
+XIRR_NEWTON_ITERATIONS = 50
+XIRR_BISECTION_ITERATIONS = 200
+XIRR_BOUNDS = (-0.9999, 100.0)  # rate per unit of time of the cash flows
+
+
+# ---------------------------------------------------------------------------
+# Time-weighted return
+# ---------------------------------------------------------------------------
+
+def time_weighted_returns(
+    values: np.ndarray,
+    flows: np.ndarray,
+    start_values: np.ndarray | None = None,
+) -> np.ndarray:
+    """Cumulative TWR of each row over all columns.
+
+    *values* are end-of-day values and *flows* the amounts invested on
+    each day (negative for withdrawals). *start_values* are the values
+    on the day before the first column (default 0). Days with nothing
+    invested have a zero return.
+    """
+    if start_values is None:
+        start_values = np.zeros(len(values))
+    previous = np.column_stack([start_values, values[:, :-1]])
+    base = previous + flows
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily = np.where(base > 0, values / base - 1.0, 0.0)
+    return np.prod(1.0 + daily, axis=1) - 1.0
+
+
+# ---------------------------------------------------------------------------
+# Money-weighted return (XIRR)
+# ---------------------------------------------------------------------------
+
+def _npv(rates: np.ndarray, cash_flows: np.ndarray, years: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        discount = (1.0 + rates)[:, None] ** -years
+        return (cash_flows * discount).sum(axis=1)
+
+
+def xirr(cash_flows: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Annualized internal rate of return of each row of *cash_flows*.
+
+    *years* is the time of each column in years from any origin, shared
+    by all rows (1-D) or per row (same shape as *cash_flows*; any unit
+    of time then gives the rate per that unit). Investments are negative
+    and proceeds (including the final value) positive. Rows without a
+    solution (e.g. all flows of one sign) return NaN.
+    """
+    years = np.broadcast_to(np.asarray(years, dtype=float), cash_flows.shape)
+    # Only dates with a flow matter.
+    used = np.any(cash_flows != 0, axis=0)
+    cash_flows = cash_flows[:, used]
+    years = years[:, used]
+    years = years - years[:, :1]
+
+    n = len(cash_flows)
+    rates = np.full(n, XIRR_GUESS)
+    converged = np.zeros(n, dtype=bool)
+    lo, hi = XIRR_BOUNDS
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(XIRR_NEWTON_ITERATIONS):
+            discount = (1.0 + rates)[:, None] ** -years
+            npv = (cash_flows * discount).sum(axis=1)
+            slope = (-years * cash_flows * discount).sum(axis=1) / (1.0 + rates)
+            step = np.where(slope != 0, npv / slope, np.nan)
+            rates = np.clip(rates - step, lo, hi)
+            converged = np.isfinite(step) & (np.abs(step) < XIRR_TOLERANCE)
+            if converged.all():
+                break
+
+    # Bisection for the rows Newton did not settle, where a root is bracketed.
+    todo = ~converged
+    if todo.any():
+        flows = cash_flows[todo]
+        times = years[todo]
+        low = np.full(len(flows), lo)
+        high = np.full(len(flows), hi)
+        npv_low = _npv(low, flows, times)
+        bracketed = np.sign(npv_low) * np.sign(_npv(high, flows, times)) < 0
+        for _ in range(XIRR_BISECTION_ITERATIONS):
+            mid = (low + high) / 2
+            npv_mid = _npv(mid, flows, times)
+            same_side = np.sign(npv_mid) == np.sign(npv_low)
+            low = np.where(same_side, mid, low)
+            npv_low = np.where(same_side, npv_mid, npv_low)
+            high = np.where(same_side, high, mid)
+        rates[todo] = np.where(bracketed, (low + high) / 2, np.nan)
+
+    return rates
+
+
+def holding_days(
+    ordinals: np.ndarray,
+    flows: np.ndarray,
+    start_values: np.ndarray | None = None,
+) -> np.ndarray:
+    """Days from each row's first investment to the last column.
+
+    A row holding a start value counts from the first column. Rows
+    never invested are NaN.
+    """
+    invested = np.asarray(flows) != 0
+    if start_values is not None:
+        invested = invested.copy()
+        invested[:, 0] |= np.asarray(start_values) != 0
+    first = np.argmax(invested, axis=1)
+    days = (ordinals[-1] - ordinals[first]).astype(float)
+    return np.where(invested.any(axis=1), days, np.nan)
+
+
+def money_weighted_returns(
+    ordinals: np.ndarray,
+    values: np.ndarray,
+    flows: np.ndarray,
+    start_values: np.ndarray | None = None,
+) -> np.ndarray:
+    """Cumulative MWR of each row over its own holding days.
+
+    *ordinals* are the dates of the columns (``date.toordinal()``). The
+    start values count as an investment on the first date and the last
+    values as proceeds on the last date. The XIRR is solved with time
+    measured in holding periods, so it is the return over the holding
+    days directly: short holdings with large gains are not clipped by
+    an annualized bound. Rows held for less than a day are NaN (use
+    :func:`annualize` with :func:`holding_days` for the yearly rate).
+    """
+    cash_flows = -np.asarray(flows, dtype=float).copy()
+    if start_values is not None:
+        cash_flows[:, 0] -= start_values
+    cash_flows[:, -1] += values[:, -1]
+
+    days = holding_days(ordinals, flows, start_values)
+    held = days > 0
+    result = np.full(len(cash_flows), np.nan)
+    if held.any():
+        span = days[held, None]
+        # 0 at each row's first investment, 1 on the last date.
+        periods = np.maximum((ordinals[None, :] - ordinals[-1] + span) / span, 0.0)
+        result[held] = xirr(cash_flows[held], periods)
+    return result
+
+
+def deannualize(rates: np.ndarray, days: float | np.ndarray) -> np.ndarray:
+    """Convert annualized rates to the return over *days* (one per row, or shared)."""
+    return (1.0 + rates) ** (days / DAYS_PER_YEAR) - 1.0
+
+
+def annualize(returns: np.ndarray, days: float | np.ndarray) -> np.ndarray:
+    """Convert returns over *days* (one per row, or shared) to annualized rates."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        return (1.0 + returns) ** (DAYS_PER_YEAR / days) - 1.0
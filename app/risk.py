@@ -0,0 +1,341 @@
+"""Risk metrics of the held tickers and of the portfolio.
+
+This module is self-contained: it depends only on numpy, the standard
+library, the settings (``app.config``), ``app.performance`` (for the
+historical EUR prices) and ``app.covariance``. None of them needs a
+database, so it can be reused by any script that needs risk statistics.
+
+Daily EUR returns are laid out as a matrix with one row per series
+(every held ticker, the benchmark, and the portfolio at its current
+weights) and one column per trading day. Every metric is computed for
+all rows at once with array operations. Missing history is NaN and is
+skipped, so tickers with short histories do not truncate the others.
+The matrix and the metrics are computed once per day and per portfolio,
+as long as every price series could be fetched.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import threading
+import warnings
+from dataclasses import dataclass, field
+from statistics import NormalDist
+
+import numpy as np
+
+from app.config import (
+    BASE_CURRENCY, RISK_BENCHMARK, RISK_BENCHMARK_CURRENCY, RISK_FREE_RATE, RISK_LOOKBACK_YEARS,
+)
+from app.covariance import covariance_matrix, portfolio_volatility
+from app.performance import eur_price_matrix
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+TRADING_DAYS_PER_YEAR = 252
+ROLLING_WINDOW_DAYS = 63  # about three months
+VAR_CONFIDENCE = 0.95
+
+PORTFOLIO = "portfolio"
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RiskMetrics:
+    """Risk statistics of one return series (daily VaR / CVaR as losses)."""
+
+    volatility_pct: float | None  # annualized, whole lookback
+    rolling_volatility_pct: float | None  # annualized, last ROLLING_WINDOW_DAYS
+    sharpe: float | None
+    sortino: float | None
+    var_historical_pct: float | None
+    cvar_historical_pct: float | None
+    var_parametric_pct: float | None
+    cvar_parametric_pct: float | None
+    max_drawdown_pct: float | None
+    max_drawdown_days: int | None  # longest time below a previous peak
+    beta: float | None
+
+
+@dataclass
+class RiskResult:
+    """Risk metrics of the portfolio, its tickers and the benchmark."""
+
+    start_date: str = ""
+    end_date: str = ""
+    benchmark: str = ""
+    confidence: float = VAR_CONFIDENCE
+    window_days: int = ROLLING_WINDOW_DAYS
+    risk_free_rate: float = 0.0
+    portfolio: RiskMetrics | None = None
+    tickers: dict[str, RiskMetrics] = field(default_factory=dict)
+    portfolio_rolling_volatility: list[dict] = field(default_factory=list)
+    portfolio_ewma_volatility_pct: float | None = None  # from the EWMA covariance
+
+
+_refresh_lock = threading.Lock()
+_refresh_generation = 0  # bumped after every computation
+_cache: tuple[tuple, RiskResult] | None = None  # complete results only
+_latest: tuple[tuple, RiskResult] | None = None  # last computation, shared with waiters
+
+
+# ---------------------------------------------------------------------------
+# Vectorized metrics (rows = series, columns = days)
+# ---------------------------------------------------------------------------
+
+def daily_returns(prices: np.ndarray) -> np.ndarray:
+    """Simple returns between consecutive columns (NaN where a price is missing)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return prices[:, 1:] / prices[:, :-1] - 1.0
+
+
+def rolling_volatility(returns: np.ndarray, window: int) -> np.ndarray:
+    """Annualized volatility over each trailing *window* of columns.
+
+    Column ``j`` of the result covers return columns ``j`` to
+    ``j + window - 1``. Uses running sums, so the cost does not depend
+    on the window length.
+    """
+    present = ~np.isnan(returns)
+    x = np.where(present, returns, 0.0)
+    zero = np.zeros((len(returns), 1))
+    s1 = np.concatenate([zero, np.cumsum(x, axis=1)], axis=1)
+    s2 = np.concatenate([zero, np.cumsum(x * x, axis=1)], axis=1)
+    c = np.concatenate([zero, np.cumsum(present, axis=1)], axis=1)
+    s1 = s1[:, window:] - s1[:, :-window]
+    s2 = s2[:, window:] - s2[:, :-window]
+    c = c[:, window:] - c[:, :-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.where(c > 1, (s2 - s1 * s1 / c) / (c - 1), np.nan)
+    return np.sqrt(np.maximum(variance, 0.0)) * math.sqrt(TRADING_DAYS_PER_YEAR)
+
+
+def drawdowns(returns: np.ndarray, ordinals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Maximum drawdown (fraction) and its longest duration (calendar days).
+
+    *ordinals* are the dates of the return columns. Missing returns
+    count as flat days.
+    """
+    wealth = np.cumprod(1.0 + np.nan_to_num(returns), axis=1)
+    peak = np.maximum.accumulate(wealth, axis=1)
+    max_drawdown = (wealth / peak - 1.0).min(axis=1, initial=0.0)
+
+    # Index of the last column at a peak, carried forward.
+    columns = np.arange(returns.shape[1])
+    last_peak = np.maximum.accumulate(np.where(wealth >= peak, columns, 0), axis=1)
+    durations = ordinals[None, :] - ordinals[last_peak]
+    return max_drawdown, durations.max(axis=1, initial=0)
+
+
+def betas(returns: np.ndarray, benchmark: np.ndarray) -> np.ndarray:
+    """Beta of each row against *benchmark*, over the days both are known."""
+    both = ~np.isnan(returns) & ~np.isnan(benchmark)[None, :]
+    n = both.sum(axis=1)
+    x = np.where(both, returns, 0.0)
+    b = np.where(both, benchmark[None, :], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = x.sum(axis=1) / n
+        mean_b = b.sum(axis=1) / n
+        cov = ((x - mean_x[:, None]) * (b - mean_b[:, None]) * both).sum(axis=1)
+        var = (((b - mean_b[:, None]) ** 2) * both).sum(axis=1)
+        return np.where((n > 1) & (var > 0), cov / var, np.nan)
+
+
+def _risk_matrix(
+    returns: np.ndarray,
+    ordinals: np.ndarray,
+    benchmark: np.ndarray,
+    risk_free_rate: float,
+    confidence: float,
+    window: int,
+) -> dict[str, np.ndarray]:
+    """Every metric of :class:`RiskMetrics`, one array entry per row."""
+    annual = math.sqrt(TRADING_DAYS_PER_YEAR)
+    rf_daily = (1.0 + risk_free_rate) ** (1.0 / TRADING_DAYS_PER_YEAR) - 1.0
+    alpha = 1.0 - confidence
+    z = NormalDist().inv_cdf(alpha)
+
+    with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+        mean = np.nanmean(returns, axis=1)
+        std = np.nanstd(returns, axis=1, ddof=1)
+        excess = returns - rf_daily
+        downside = np.sqrt(np.nanmean(np.minimum(excess, 0.0) ** 2, axis=1))
+
+        quantile = np.nanquantile(returns, alpha, axis=1)
+        tail = np.where(returns <= quantile[:, None], returns, np.nan)
+        cvar_hist = -np.nanmean(tail, axis=1)
+
+        rolling = rolling_volatility(returns, window) if returns.shape[1] >= window else None
+        max_dd, dd_days = drawdowns(returns, ordinals)
+
+        return {
+            "volatility_pct": std * annual * 100,
+            "rolling_volatility_pct": (
+                rolling[:, -1] * 100 if rolling is not None else np.full(len(returns), np.nan)
+            ),
+            "sharpe": (mean - rf_daily) / std * annual,
+            "sortino": (mean - rf_daily) / downside * annual,
+            "var_historical_pct": -quantile * 100,
+            "cvar_historical_pct": cvar_hist * 100,
+            "var_parametric_pct": -(mean + z * std) * 100,
+            "cvar_parametric_pct": -(mean - std * NormalDist().pdf(z) / alpha) * 100,
+            "max_drawdown_pct": max_dd * 100,
+            "max_drawdown_days": dd_days,
+            "beta": betas(returns, benchmark),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Portfolio
+# ---------------------------------------------------------------------------
+
+def _holdings(positions: list[dict]) -> tuple[dict[str, str], dict[str, float]]:
+    """(currency, total quantity) per held ticker."""
+    currencies: dict[str, str] = {}
+    quantities: dict[str, float] = {}
+    for pos in positions:
+        ticker = pos["ticker"]
+        currencies.setdefault(ticker, pos.get("currency", BASE_CURRENCY))
+        quantities[ticker] = quantities.get(ticker, 0.0) + float(pos["qty"])
+    return currencies, quantities
+
+
+def portfolio_returns(returns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Daily returns of a portfolio held at constant *weights*.
+
+    Each day, the weights of rows with no return yet (not listed) are
+    spread over the others.
+    """
+    present = ~np.isnan(returns)
+    active = (weights[:, None] * present).sum(axis=0)
+    weighted = np.where(present, returns, 0.0) * weights[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(active > 0, weighted.sum(axis=0) / active, np.nan)
+
+
+def _round(value, digits: int = 2):
+    value = float(value)
+    return round(value, digits) + 0.0 if math.isfinite(value) else None  # no -0.0
+
+
+def _compute(
+    currencies: dict[str, str],
+    quantities: dict[str, float],
+    benchmark: str,
+    today: datetime.date,
+) -> tuple[RiskResult, bool]:
+    """The risk result, and whether every held ticker and the benchmark had prices."""
+    symbols = dict(currencies)
+    symbols.setdefault(benchmark, RISK_BENCHMARK_CURRENCY)
+    start = today - datetime.timedelta(days=round(365.25 * RISK_LOOKBACK_YEARS))
+    dates, prices = eur_price_matrix(symbols, start, today)
+    result = RiskResult(
+        start_date=start.isoformat(),
+        end_date=today.isoformat(),
+        benchmark=benchmark,
+        risk_free_rate=RISK_FREE_RATE,
+    )
+    if len(dates) < 2:
+        return result, False
+    complete = not np.isnan(prices).all(axis=1).any()
+
+    tickers = list(symbols)
+    returns = daily_returns(prices)
+    ordinals = np.array([d.toordinal() for d in dates[1:]], dtype=int)
+
+    # Current EUR value of each held ticker (last known close).
+    held = np.array([t in quantities for t in tickers])
+    last_known = np.where(
+        np.isnan(prices), -1, np.arange(prices.shape[1])
+    ).max(axis=1)
+    last_price = np.where(
+        last_known >= 0, prices[np.arange(len(tickers)), np.maximum(last_known, 0)], 0.0,
+    )
+    qty = np.array([quantities.get(t, 0.0) for t in tickers])
+    weights = np.where(held, qty * np.nan_to_num(last_price), 0.0)
+
+    portfolio = portfolio_returns(returns, weights)
+    matrix = np.vstack([returns, portfolio[None, :]])
+    metrics = _risk_matrix(
+        matrix, ordinals, returns[tickers.index(benchmark)],
+        RISK_FREE_RATE, VAR_CONFIDENCE, ROLLING_WINDOW_DAYS,
+    )
+
+    names = tickers + [PORTFOLIO]
+    no_data = np.isnan(matrix).all(axis=1)
+    for i, name in enumerate(names):
+        if no_data[i]:
+            row = RiskMetrics(**dict.fromkeys(metrics))
+        else:
+            row = RiskMetrics(**{
+                k: (int(v[i]) if k == "max_drawdown_days" else _round(v[i]))
+                for k, v in metrics.items()
+            })
+        if name == PORTFOLIO:
+            result.portfolio = row
+        else:
+            result.tickers[name] = row
+
+    if returns.shape[1] >= ROLLING_WINDOW_DAYS:
+        rolling = rolling_volatility(portfolio[None, :], ROLLING_WINDOW_DAYS)[0] * 100
+        result.portfolio_rolling_volatility = [
+            {"date": d.isoformat(), "volatility_pct": _round(v)}
+            for d, v in zip(dates[ROLLING_WINDOW_DAYS:], rolling)
+        ]
+
+    held_tickers = [t for t in tickers if t in quantities]
+    cov = covariance_matrix({t: currencies[t] for t in held_tickers})
+    ewma_volatility = portfolio_volatility(cov, weights[held])
+    if ewma_volatility is not None:
+        result.portfolio_ewma_volatility_pct = _round(ewma_volatility * 100)
+
+    return result, complete
+
+
+def compute_risk(positions: list[dict], benchmark: str = RISK_BENCHMARK) -> RiskResult:
+    """Risk metrics of every held ticker, the benchmark and the portfolio.
+
+    The portfolio is valued at its current weights (quantity times last
+    EUR close) over the whole lookback, as a historical simulation of
+    today's holdings. Cached for the day, per holdings and benchmark,
+    unless a held ticker or the benchmark had no prices (e.g. a failed
+    download), so the next call retries.
+
+    Computations are single-flight: while one runs, other callers wait
+    for it and share its result. Cache hits never wait.
+    """
+    global _cache, _latest, _refresh_generation
+    currencies, quantities = _holdings(positions)
+    if not currencies:
+        return RiskResult(benchmark=benchmark, risk_free_rate=RISK_FREE_RATE)
+
+    today = datetime.date.today()
+    key = (today, benchmark, tuple(sorted(currencies.items())), tuple(sorted(quantities.items())))
+    cached = _cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    generation = _refresh_generation
+    with _refresh_lock:
+        latest = _latest
+        if _refresh_generation != generation and latest is not None and latest[0] == key:
+            # Computed while we were waiting: share its result.
+            return latest[1]
+        cached = _cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        result, complete = _compute(currencies, quantities, benchmark, today)
+        _latest = (key, result)
+        _refresh_generation += 1
+        if complete:
+            _cache = (key, result)
+        return result
@@ -0,0 +1,138 @@
+"""Periodic background jobs running on the API's event loop.
+
+This module is self-contained: it depends only on the standard library
+(asyncio), so it can be reused by any async application that needs to
+keep caches warm.
+
+Each job is a blocking callable run in a worker thread on its own
+interval. Intervals are randomized by ``±jitter`` (and first runs
+staggered) so jobs do not hit upstream APIs in lockstep. A job never
+overlaps itself: a run requested while the previous one is still going
+is skipped. Per-job timings and outcomes are kept for monitoring.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Job:
+    name: str
+    fn: Callable[[], object]
+    interval_seconds: float
+    jitter: float
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_started: float | None = None  # epoch seconds
+    last_duration_seconds: float | None = None
+    last_error: str | None = None
+    next_run: float | None = None  # epoch seconds
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+class Scheduler:
+    """Run registered jobs periodically until :meth:`stop` is called."""
+
+    def __init__(self, jitter: float = 0.1):
+        self.jitter = jitter
+        self._jobs: dict[str, _Job] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        interval_seconds: float,
+        jitter: float | None = None,
+    ) -> None:
+        """Register *fn* to run every *interval_seconds* (0 disables it)."""
+        if interval_seconds <= 0:
+            return
+        self._jobs[name] = _Job(
+            name=name,
+            fn=fn,
+            interval_seconds=interval_seconds,
+            jitter=self.jitter if jitter is None else jitter,
+        )
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start one loop task per job on the running event loop."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._loop(job), name=f"scheduler-{job.name}")
+            for job in self._jobs.values()
+        ]
+
+    async def stop(self) -> None:
+        """Cancel all job loops (a run in progress finishes in its thread)."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_job(self, name: str) -> bool:
+        """Run a job now. Returns False if it was already running."""
+        job = self._jobs[name]
+        if job.lock.locked():
+            job.skipped += 1
+            return False
+        async with job.lock:
+            job.last_started = time.time()
+            t0 = time.monotonic()
+            try:
+                await asyncio.to_thread(job.fn)
+                job.last_error = None
+            except Exception as e:
+                job.failures += 1
+                job.last_error = str(e) or type(e).__name__
+            finally:
+                job.runs += 1
+                job.last_duration_seconds = round(time.monotonic() - t0, 3)
+        return True
+
+    async def _loop(self, job: _Job) -> None:
+        # Stagger first runs over a fraction of the interval.
+        delay = random.uniform(0, job.jitter * job.interval_seconds)
+        while True:
+            job.next_run = time.time() + delay
+            await asyncio.sleep(delay)
+            await self.run_job(job.name)
+            delay = job.interval_seconds * random.uniform(1 - job.jitter, 1 + job.jitter)
+
+    def status(self) -> list[dict]:
+        """Per-job configuration, last-run timings and counters."""
+        return [
+            {
+                "name": job.name,
+                "interval_seconds": job.interval_seconds,
+                "jitter": job.jitter,
+                "running": job.lock.locked(),
+                "runs": job.runs,
+                "failures": job.failures,
+                "skipped": job.skipped,
+                "last_started": job.last_started,
+                "last_duration_seconds": job.last_duration_seconds,
+                "last_error": job.last_error,
+                "next_run": job.next_run if self._tasks else None,
+            }
+            for job in self._jobs.values()
+        ]
@@ -1,15 +1,16 @@
 """ETF sector-exposure fetching and portfolio-level aggregation.
 
-This module is self-contained: it depends only on yfinance and the
-standard library, so it can be reused by any script that needs
-sector data.
+This module is self-contained: it depends only on the standard library,
+``app.concurrency`` and ``app.funds``, so it can be reused by any script
+that needs sector data.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-import yfinance as yf
+from app.concurrency import FETCH_MAX_WORKERS, FETCH_TIMEOUT_SECONDS, map_bounded
+from app.funds import fetch_fund_profile
 
 
 # ---------------------------------------------------------------------------
@@ -64,28 +65,12 @@ class SectorExposureResult:
 # ---------------------------------------------------------------------------
 
 def fetch_etf_sectors(ticker: str) -> dict[str, float]:
-    """Fetch sector weightings for a single ETF via yfinance.
+    """Fetch sector weightings for a single ETF (from its shared fund profile).
 
-    Returns a dict ``{"Technology": 0.25, ...}`` or an empty dict when
-    data is unavailable (graceful degradation).
+    Returns a dict ``{"technology": 0.25, ...}`` keyed by yfinance sector
+    names, or an empty dict when data is unavailable (graceful degradation).
     """
-    try:
-        etf = yf.Ticker(ticker)
-        weightings = etf.funds_data.sector_weightings
-        if weightings is None:
-            return {}
-        # sector_weightings is a dict of dicts: {sector: {weight: value}}
-        # or a simple dict depending on yfinance version
-        result: dict[str, float] = {}
-        if isinstance(weightings, dict):
-            for sector, value in weightings.items():
-                if isinstance(value, dict):
-                    result[sector] = float(list(value.values())[0])
-                else:
-                    result[sector] = float(value)
-        return result
-    except Exception:
-        return {}
+    return fetch_fund_profile(ticker).sector_weightings
 
 
 # ---------------------------------------------------------------------------
@@ -118,10 +103,18 @@ def compute_sector_exposure(
     etfs_no_data: list[str] = []
     covered_mv = 0.0
 
+    # Scrape all ETFs concurrently; failures and timeouts count as no data.
+    fetched, _ = map_bounded(
+        fetch_etf_sectors,
+        [p["ticker"] for p in valid],
+        max_workers=FETCH_MAX_WORKERS,
+        timeout=FETCH_TIMEOUT_SECONDS,
+    )
+
     for pos in valid:
         ticker = pos["ticker"]
         etf_weight = pos["market_value_eur"] / total_mv
-        sectors = fetch_etf_sectors(ticker)
+        sectors = fetched.get(ticker)
 
         if not sectors:
             etfs_no_data.append(ticker)
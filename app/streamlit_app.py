@@ -4,13 +4,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-API_URL = "http://localhost:8000/portfolio"
-HOLDINGS_URL = "http://localhost:8000/holdings/top"
-SECTORS_URL = "http://localhost:8000/sectors"
 PERFORMANCE_URL = "http://localhost:8000/performance"
-MACRO_URL = "http://localhost:8000/macro"
 TARGET_URL = "http://localhost:8000/target"
-DRIFT_URL = "http://localhost:8000/drift"
+DASHBOARD_URL = "http://localhost:8000/dashboard"
 
 st.set_page_config(page_title="Invest Buddy", layout="wide")
 st.title("Invest Buddy")
@@ -23,24 +19,18 @@ CURRENCY_SYMBOLS = {"EUR": "\u20ac", "USD": "$", "GBP": "\u00a3", "CHF": "CHF",
 # ---------------------------------------------------------------------------
 
 @st.cache_data(ttl=300)
-def fetch_portfolio():
-    resp = requests.get(API_URL, timeout=30)
+def fetch_dashboard(refresh: bool = False):
+    """All tabs in one call (positions priced once server-side)."""
+    resp = requests.get(DASHBOARD_URL, params={"refresh": refresh}, timeout=180)
     resp.raise_for_status()
     return resp.json()
 
 
-@st.cache_data(ttl=300)
-def fetch_top_holdings():
-    resp = requests.get(HOLDINGS_URL, timeout=60)
-    resp.raise_for_status()
-    return resp.json()
-
-
-@st.cache_data(ttl=300)
-def fetch_sectors():
-    resp = requests.get(SECTORS_URL, timeout=60)
-    resp.raise_for_status()
-    return resp.json()
+def dashboard_section(dashboard: dict, name: str):
+    """Return one section of the dashboard, raising its error if it failed."""
+    if name not in dashboard:
+        raise RuntimeError(dashboard.get("errors", {}).get(name, "section indisponible"))
+    return dashboard[name]
 
 
 @st.cache_data(ttl=300)
@@ -50,13 +40,6 @@ def fetch_performance(period: str):
     return resp.json()
 
 
-@st.cache_data(ttl=300)
-def fetch_macro(refresh: bool = False):
-    resp = requests.get(MACRO_URL, params={"refresh": refresh}, timeout=120)
-    resp.raise_for_status()
-    return resp.json()
-
-
 @st.cache_data(ttl=300)
 def fetch_target(mode: str = "smart"):
     resp = requests.get(TARGET_URL, params={"mode": mode}, timeout=30)
@@ -64,19 +47,13 @@ def fetch_target(mode: str = "smart"):
     return resp.json()
 
 
-@st.cache_data(ttl=300)
-def fetch_drift():
-    resp = requests.get(DRIFT_URL, timeout=30)
-    resp.raise_for_status()
-    return resp.json()
-
-
 # ---------------------------------------------------------------------------
 # Load portfolio data (required for all tabs)
 # ---------------------------------------------------------------------------
 
 try:
-    data = fetch_portfolio()
+    dashboard = fetch_dashboard(refresh=st.session_state.get("_macro_refresh", False))
+    data = dashboard_section(dashboard, "portfolio")
 except requests.exceptions.ConnectionError:
     st.error("Impossible de se connecter a l'API FastAPI. Verifiez qu'elle est lancee sur le port 8000.")
     st.stop()
@@ -102,7 +79,7 @@ st.divider()
 # ---------------------------------------------------------------------------
 
 try:
-    macro_data = fetch_macro(refresh=st.session_state.get("_macro_refresh", False))
+    macro_data = dashboard_section(dashboard, "macro")
     if st.session_state.get("_macro_refresh"):
         st.session_state["_macro_refresh"] = False
 except Exception as e:
@@ -164,7 +141,7 @@ with tab_positions:
 with tab_holdings:
 
     try:
-        holdings_data = fetch_top_holdings()
+        holdings_data = dashboard_section(dashboard, "holdings")
     except Exception as e:
         st.warning(f"Impossible de recuperer les holdings: {e}")
         holdings_data = None
@@ -193,7 +170,7 @@ with tab_holdings:
 with tab_sectors:
 
     try:
-        sectors_data = fetch_sectors()
+        sectors_data = dashboard_section(dashboard, "sectors")
     except Exception as e:
         st.warning(f"Impossible de recuperer les secteurs: {e}")
         sectors_data = None
@@ -254,7 +231,10 @@ with tab_performance:
     selected_period = period_options[selected_label]
 
     try:
-        perf_data = fetch_performance(selected_period)
+        if selected_period == "ALL":
+            perf_data = dashboard_section(dashboard, "performance")
+        else:
+            perf_data = fetch_performance(selected_period)
     except Exception as e:
         st.warning(f"Impossible de recuperer la performance: {e}")
         perf_data = None
@@ -609,7 +589,7 @@ with tab_macro:
     col_refresh, _ = st.columns([1, 5])
     with col_refresh:
         if st.button("Rafraichir les donnees"):
-            fetch_macro.clear()
+            fetch_dashboard.clear()
             st.session_state["_macro_refresh"] = True
             st.rerun()
 
@@ -651,7 +631,10 @@ with tab_target:
     mode_param = "smart" if "Smart" in target_mode else "static"
 
     try:
-        target_data = fetch_target(mode=mode_param)
+        if mode_param == "smart":
+            target_data = dashboard_section(dashboard, "target")
+        else:
+            target_data = fetch_target(mode=mode_param)
     except Exception as e:
         st.warning(f"Impossible de recuperer l'allocation cible: {e}")
         target_data = None
@@ -754,7 +737,7 @@ with tab_drift:
     st.caption("Drift calcule par rapport a target_portfolio.yaml (allocation statique par ETF).")
 
     try:
-        drift_data = fetch_drift()
+        drift_data = dashboard_section(dashboard, "drift")
     except Exception as e:
         st.warning(f"Impossible de recuperer le drift: {e}")
         drift_data = None
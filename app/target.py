@@ -8,12 +8,10 @@ Drift computation compares live portfolio vs static target_portfolio.yaml.
 
 from __future__ import annotations
 
-import os
 from dataclasses import dataclass, field
 
-import yaml
-
 from app.config import TARGET_PATH
+from app.config_registry import load_yaml
 
 
 # ---------------------------------------------------------------------------
@@ -25,6 +23,7 @@ class TargetAllocation:
     ticker: str
     name: str
     weight_pct: float
+    currency: str | None = None  # quote currency, optional (needed for tickers not held)
 
 
 @dataclass
@@ -59,18 +58,17 @@ class DriftResult:
 
 def load_target_portfolio() -> TargetPortfolioResult:
     """Load target_portfolio.yaml and return parsed allocations."""
-    if not os.path.exists(TARGET_PATH):
+    data = load_yaml(TARGET_PATH)
+    if data is None:
         return TargetPortfolioResult()
 
-    with open(TARGET_PATH, "r") as f:
-        data = yaml.safe_load(f) or {}
-
     raw = data.get("target_allocations", []) or []
     allocations = [
         TargetAllocation(
             ticker=entry["ticker"],
             name=entry.get("name", entry["ticker"]),
             weight_pct=float(entry["weight_pct"]),
+            currency=entry.get("currency"),
         )
         for entry in raw
     ]
@@ -0,0 +1,151 @@
+"""Benchmark: single-scan keyword matcher vs per-keyword substring checks.
+
+Builds a synthetic corpus of RSS-like items (filler words mixed with zone
+keywords and the occasional low-value pattern), then times
+``app.macro._classify_news`` against the original pair of functions it
+replaced, which ran one ``in`` check per keyword. Results are checked for
+equality before timings are reported.
+
+No network access is needed. Run from the repository root:
+
+    python -m benchmarks.bench_news_classify
+    python -m benchmarks.bench_news_classify --items 10000 --keywords-scale 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app import macro
+from app.keywords import KeywordMatcher
+
+
+SOURCES = ["Reuters", "Les Echos", "BCE", "Fed", "FT", "Bloomberg"]
+FILLER = (
+    "the a of to and in for on with as by at from says said after new "
+    "year week report shares growth rates policy data market investors "
+    "les des une pour dans sur avec par plus selon hausse baisse"
+).split()
+
+
+# ---------------------------------------------------------------------------
+# Reference implementation (one substring search per keyword)
+# ---------------------------------------------------------------------------
+
+def _legacy_classify_news_zone(
+    title: str, summary: str, source: str, zone_keywords: dict[str, list[str]],
+) -> str:
+    text = f" {title} {summary} ".lower()
+
+    if source in ("BCE", "ECB"):
+        return "Europe"
+    if source in ("Fed", "Federal Reserve"):
+        return "US"
+
+    scores: dict[str, int] = {}
+    for zone, keywords in zone_keywords.items():
+        score = sum(1 for kw in keywords if kw.lower() in text)
+        if score > 0:
+            scores[zone] = score
+
+    if not scores:
+        return "Autre"
+
+    return max(scores, key=scores.get)
+
+
+def _legacy_is_impactful_news(title: str, summary: str, patterns: list[str]) -> bool:
+    combined = f"{title} {summary}".lower()
+    return not any(pattern in combined for pattern in patterns)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def _scaled_keywords(scale: int) -> dict[str, list[str]]:
+    """Zone keywords, plus (scale - 1) synthetic variants of each list."""
+    zones: dict[str, list[str]] = {}
+    for zone, keywords in macro._NEWS_ZONE_KEYWORDS.items():
+        extra = [f"{kw.strip()}{i}x" for i in range(1, scale) for kw in keywords]
+        zones[zone] = keywords + extra
+    return zones
+
+
+def _build_corpus(n_items: int, zone_keywords: dict[str, list[str]], seed: int = 42):
+    rng = random.Random(seed)
+    vocabulary = [kw.strip() for kws in zone_keywords.values() for kw in kws]
+
+    def sentence(n_words: int, n_keywords: int) -> str:
+        words = [rng.choice(FILLER) for _ in range(n_words)]
+        for _ in range(n_keywords):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(vocabulary))
+        if rng.random() < 0.05:
+            words.append(rng.choice(macro._LOW_VALUE_PATTERNS))
+        return " ".join(words).capitalize()
+
+    return [
+        (
+            sentence(rng.randint(6, 14), rng.randint(0, 2)),
+            sentence(rng.randint(20, 35), rng.randint(0, 4)),
+            rng.choice(SOURCES),
+        )
+        for _ in range(n_items)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _run_legacy(corpus, zone_keywords):
+    patterns = macro._LOW_VALUE_PATTERNS
+    return [
+        (
+            _legacy_classify_news_zone(title, summary, source, zone_keywords),
+            _legacy_is_impactful_news(title, summary, patterns),
+        )
+        for title, summary, source in corpus
+    ]
+
+
+def _run_matcher(corpus):
+    return [macro._classify_news(title, summary, source) for title, summary, source in corpus]
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--keywords-scale", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    print(f"{'keywords':>9} {'items':>7} {'legacy (s)':>11} {'matcher (s)':>12} {'speedup':>8}")
+    for scale in args.keywords_scale:
+        zone_keywords = _scaled_keywords(scale)
+        corpus = _build_corpus(args.items, zone_keywords)
+        # Swap in a matcher compiled from the scaled keyword lists.
+        macro._NEWS_MATCHER = KeywordMatcher(
+            {**zone_keywords, macro._LOW_VALUE: macro._LOW_VALUE_PATTERNS},
+        )
+
+        legacy_s, legacy = _time(_run_legacy, corpus, zone_keywords)
+        fast_s, fast = _time(_run_matcher, corpus)
+        if legacy != fast:
+            raise SystemExit(f"Mismatch between legacy and matcher output at scale {scale}")
+        n_keywords = sum(len(kws) for kws in zone_keywords.values())
+        print(
+            f"{n_keywords:>9} {args.items:>7} {legacy_s:>11.3f} "
+            f"{fast_s:>12.3f} {legacy_s / fast_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
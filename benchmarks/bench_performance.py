@@ -0,0 +1,169 @@
+"""Benchmark: vectorized daily valuation vs the original per-date loop.
+
+Builds a synthetic portfolio (random lots over a pool of tickers, half of
+them quoted in USD) with synthetic price and FX histories, then times
+``app.performance._compute_daily`` against the scalar reference loop it
+replaced. Results are checked for equality before timings are reported.
+
+No network access is needed. Run from the repository root:
+
+    python -m benchmarks.bench_performance
+    python -m benchmarks.bench_performance --years 3 --lots 10 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.performance import BASE_CURRENCY, DailyPerformance, _compute_daily, _Lot
+
+
+N_TICKERS = 20
+
+
+# ---------------------------------------------------------------------------
+# Reference implementation (pre-vectorization loop)
+# ---------------------------------------------------------------------------
+
+def _legacy_compute_daily(
+    lots: list[_Lot],
+    trading_dates: list[datetime.date],
+    price_series: dict[str, pd.Series],
+    fx_series: dict[str, pd.Series],
+) -> list[DailyPerformance]:
+    daily_results: list[DailyPerformance] = []
+    running_peak = 0.0
+
+    for date in trading_dates:
+        portfolio_value = 0.0
+        total_cost = 0.0
+
+        for lot in lots:
+            if date < lot.date:
+                continue
+
+            currency = lot.currency.upper()
+
+            prices = price_series.get(lot.ticker, pd.Series(dtype=float))
+            available = prices[prices.index <= date]
+            if available.empty:
+                continue
+            close_price = float(available.iloc[-1])
+
+            if currency == BASE_CURRENCY.upper():
+                fx_rate = 1.0
+            else:
+                fx = fx_series.get(currency, pd.Series(dtype=float))
+                fx_available = fx[fx.index <= date]
+                if fx_available.empty:
+                    continue
+                fx_rate = float(fx_available.iloc[-1])
+
+            portfolio_value += lot.qty * close_price * fx_rate
+            total_cost += lot.cost_basis_eur
+
+        if total_cost == 0:
+            continue
+
+        pnl_eur = portfolio_value - total_cost
+        pnl_pct = (pnl_eur / total_cost) * 100
+
+        if portfolio_value > running_peak:
+            running_peak = portfolio_value
+        drawdown_pct = (
+            (portfolio_value - running_peak) / running_peak * 100
+            if running_peak > 0
+            else 0.0
+        )
+
+        daily_results.append(DailyPerformance(
+            date=date.isoformat(),
+            portfolio_value_eur=round(portfolio_value, 2),
+            cost_basis_eur=round(total_cost, 2),
+            pnl_eur=round(pnl_eur, 2),
+            pnl_pct=round(pnl_pct, 2),
+            drawdown_pct=round(drawdown_pct, 2),
+        ))
+
+    return daily_results
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def _random_walk(dates: list[datetime.date], start: float, rng: np.random.Generator) -> pd.Series:
+    steps = rng.normal(0.0003, 0.012, len(dates))
+    return pd.Series(start * np.exp(np.cumsum(steps)), index=dates)
+
+
+def _build_inputs(n_lots: int, years: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    pyrng = random.Random(seed)
+    end = datetime.date.today()
+    start = end - datetime.timedelta(days=365 * years)
+    all_days = list(pd.bdate_range(start, end).date)
+
+    tickers = [f"ETF{i:02d}" for i in range(N_TICKERS)]
+    currencies = {t: ("USD" if i % 2 else "EUR") for i, t in enumerate(tickers)}
+
+    price_series: dict[str, pd.Series] = {}
+    for t in tickers:
+        # Drop ~3% of days per ticker to exercise forward-filling.
+        days = [d for d in all_days if pyrng.random() > 0.03]
+        price_series[t] = _random_walk(days, rng.uniform(20, 200), rng)
+    fx_series = {"USD": _random_walk(all_days, 0.92, rng)}
+
+    lots: list[_Lot] = []
+    for _ in range(n_lots):
+        t = pyrng.choice(tickers)
+        lot_date = pyrng.choice(all_days)
+        price = float(price_series[t].asof(lot_date) or 100.0)
+        fx = 1.0 if currencies[t] == "EUR" else float(fx_series["USD"].asof(lot_date))
+        qty = pyrng.randint(1, 50)
+        lots.append(_Lot(
+            ticker=t, qty=qty, price=price, date=lot_date,
+            currency=currencies[t], cost_basis_eur=qty * price * fx,
+        ))
+
+    trading_dates = sorted({d for s in price_series.values() for d in s.index})
+    return lots, trading_dates, price_series, fx_series
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _time(fn, *args) -> tuple[float, list[DailyPerformance]]:
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lots", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--years", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'lots':>6} {'dates':>6} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for n_lots in args.lots:
+        inputs = _build_inputs(n_lots, args.years)
+        legacy_s, legacy = _time(_legacy_compute_daily, *inputs)
+        fast_s, fast = _time(_compute_daily, *inputs)
+        if legacy != fast:
+            raise SystemExit(f"Mismatch between legacy and vectorized output at {n_lots} lots")
+        print(
+            f"{n_lots:>6} {len(inputs[1]):>6} {legacy_s:>12.3f} "
+            f"{fast_s:>15.4f} {legacy_s / fast_s:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
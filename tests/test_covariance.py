@@ -0,0 +1,89 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from app import covariance
+
+
+TODAY = datetime.date.today()
+DATES = [TODAY - datetime.timedelta(days=i) for i in range(700, -30, -1)]
+
+
+@pytest.fixture
+def prices(monkeypatch):
+    """Synthetic EUR closes of three tickers, served like eur_price_matrix."""
+    rng = np.random.default_rng(7)
+    matrix = 100 * np.cumprod(1 + rng.normal(0, 0.01, (3, len(DATES))), axis=1)
+    tickers = ["A", "B", "C"]
+    missing: set[str] = set()
+
+    def eur_price_matrix(currencies, start, end):
+        columns = [i for i, d in enumerate(DATES) if start <= d <= end]
+        rows = np.array([matrix[tickers.index(t)] for t in currencies])[:, columns]
+        for i, ticker in enumerate(currencies):
+            if ticker in missing:
+                rows[i] = np.nan
+        return [DATES[i] for i in columns], rows
+
+    monkeypatch.setattr(covariance, "eur_price_matrix", eur_price_matrix)
+    monkeypatch.setattr(covariance, "_state", None)
+    monkeypatch.setattr(covariance, "_missing_since", {})
+    return missing
+
+
+CURRENCIES = {"A": "EUR", "B": "EUR", "C": "EUR"}
+
+
+def test_incremental_update_equals_full_rebuild(prices):
+    state = covariance._build(CURRENCIES, TODAY)
+    later = TODAY + datetime.timedelta(days=10)
+
+    advanced = covariance._advance(state, later)
+    rebuilt = covariance._build(CURRENCIES, later)
+
+    assert advanced.updates == 10
+    assert advanced.last_date == rebuilt.last_date
+    np.testing.assert_allclose(advanced.cov, rebuilt.cov, rtol=1e-6)
+    np.testing.assert_allclose(advanced.last_prices, rebuilt.last_prices)
+
+
+def test_provisional_day_is_not_folded_into_the_state(prices):
+    state = covariance._build(CURRENCIES, TODAY)
+    assert state.provisional is not None  # TODAY has a close
+    assert state.last_date == TODAY - datetime.timedelta(days=1)
+
+    again = covariance._advance(state, TODAY)
+    assert again.updates == 0
+    np.testing.assert_array_equal(again.cov, state.cov)
+
+
+def test_build_matches_ewma_recursion(prices):
+    state = covariance._build(CURRENCIES, TODAY)
+    _, matrix = covariance.eur_price_matrix(
+        CURRENCIES, TODAY - datetime.timedelta(days=covariance.WARMUP_DAYS), TODAY,
+    )
+    closed = matrix[:, :-1]
+    cov = np.zeros((3, 3))
+    for t in range(1, closed.shape[1]):
+        r = closed[:, t] / closed[:, t - 1] - 1
+        cov = covariance.EWMA_DECAY * cov + (1 - covariance.EWMA_DECAY) * np.outer(r, r)
+    np.testing.assert_allclose(state.cov, cov, rtol=1e-10)
+
+
+def test_ticker_without_history_is_unknown_and_retried_later(prices, monkeypatch):
+    prices.add("C")
+    clock = [1000.0]
+    monkeypatch.setattr(covariance.time, "monotonic", lambda: clock[0])
+
+    cov = covariance.covariance_matrix(CURRENCIES)
+    assert np.isnan(cov[2]).all() and np.isnan(cov[:, 2]).all()
+    assert np.isfinite(cov[:2, :2]).all()
+
+    state = covariance._state
+    prices.clear()
+    covariance.covariance_matrix(CURRENCIES)
+    assert covariance._state is state  # no rebuild inside the retry window
+
+    clock[0] += covariance.TAIL_REFRESH_SECONDS
+    assert np.isfinite(covariance.covariance_matrix(CURRENCIES)).all()
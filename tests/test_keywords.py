@@ -0,0 +1,36 @@
+import random
+
+from app.keywords import KeywordMatcher
+
+
+GROUPS = {
+    "Europe": ["euro", "eurozone", "zone euro", "bce", "ecb"],
+    "US": ["fed", "federal reserve", "us ", "wall street"],
+    "Asie": ["china", "chine", "japan", "boj", "zone"],
+}
+
+
+def _baseline(text: str) -> set[str]:
+    return {kw for keywords in GROUPS.values() for kw in keywords if kw in text}
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = KeywordMatcher(GROUPS)
+    text = " la zone euro et la eurozone face a la fed "
+    assert matcher.keywords(text) == _baseline(text)
+    assert {"euro", "eurozone", "zone euro", "zone", "fed"} <= matcher.keywords(text)
+
+
+def test_matches_equal_substring_search_on_random_text():
+    matcher = KeywordMatcher(GROUPS)
+    rng = random.Random(3)
+    vocabulary = [kw for keywords in GROUPS.values() for kw in keywords]
+    vocabulary += ["the", "market", "rates", "zo", "eur", "federa", "s", " "]
+    for _ in range(500):
+        text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+        assert matcher.keywords(text) == _baseline(text)
+
+
+def test_counts_per_label_including_shared_keywords():
+    matcher = KeywordMatcher({"a": ["rate", "rates"], "b": ["rates", "bond"], "c": ["gold"]})
+    assert matcher.counts("rates and bonds") == {"a": 2, "b": 2, "c": 0}
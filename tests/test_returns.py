@@ -0,0 +1,82 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from app import returns
+
+
+def _ordinals(*dates: str) -> np.ndarray:
+    return np.array([datetime.date.fromisoformat(d).toordinal() for d in dates])
+
+
+def test_xirr_single_year():
+    rates = returns.xirr(np.array([[-1000.0, 1100.0]]), np.array([0.0, 1.0]))
+    assert rates[0] == pytest.approx(0.10)
+
+
+def test_xirr_known_value():
+    # Reference example of spreadsheet XIRR functions (365-day years).
+    ordinals = _ordinals("2008-01-01", "2008-03-01", "2008-10-30", "2009-02-15", "2009-04-01")
+    flows = np.array([[-10000.0, 2750.0, 4250.0, 3250.0, 2750.0]])
+    years = (ordinals - ordinals[0]) / returns.DAYS_PER_YEAR
+    assert returns.xirr(flows, years)[0] == pytest.approx(0.373362535, abs=1e-8)
+
+
+def test_xirr_without_solution_is_nan():
+    rates = returns.xirr(np.array([[100.0, 50.0]]), np.array([0.0, 1.0]))
+    assert np.isnan(rates[0])
+
+
+def test_twr_ignores_contributions():
+    # Doubles on day 1, then 100 more invested: performance stays +100 %.
+    values = np.array([[100.0, 200.0, 300.0]])
+    flows = np.array([[100.0, 0.0, 100.0]])
+    assert returns.time_weighted_returns(values, flows)[0] == pytest.approx(1.0)
+
+
+def test_late_start_mwr_equals_twr_for_single_contribution():
+    # 600-day period; 100 invested on day 580, worth 106 on day 600.
+    ordinals = np.arange(601)
+    values = np.zeros((1, 601))
+    flows = np.zeros((1, 601))
+    flows[0, 580] = 100.0
+    values[0, 580:] = np.linspace(100.0, 106.0, 21)
+
+    assert returns.holding_days(ordinals, flows)[0] == 20
+    twr = returns.time_weighted_returns(values, flows)
+    mwr = returns.money_weighted_returns(ordinals, values, flows)
+    assert twr[0] == pytest.approx(0.06)
+    assert mwr[0] == pytest.approx(twr[0])
+
+
+def test_start_value_counts_from_first_column():
+    ordinals = np.arange(11)
+    values = np.full((1, 11), 110.0)
+    flows = np.zeros((1, 11))
+    start = np.array([100.0])
+    assert returns.holding_days(ordinals, flows, start)[0] == 10
+    assert returns.money_weighted_returns(ordinals, values, flows, start)[0] == pytest.approx(0.10)
+
+
+def test_short_holding_with_large_gain_is_not_clipped():
+    ordinals = np.arange(11)
+    values = np.zeros((1, 11))
+    flows = np.zeros((1, 11))
+    flows[0, 0] = 100.0
+    values[0, -1] = 300.0
+    assert returns.money_weighted_returns(ordinals, values, flows)[0] == pytest.approx(2.0)
+
+
+def test_never_invested_row_is_nan():
+    ordinals = np.arange(5)
+    zeros = np.zeros((1, 5))
+    assert np.isnan(returns.holding_days(ordinals, zeros)[0])
+    assert np.isnan(returns.money_weighted_returns(ordinals, zeros, zeros)[0])
+
+
+def test_annualize_roundtrip():
+    days = np.array([30.0, 400.0, 1000.0])
+    rates = np.array([0.05, -0.2, 0.12])
+    back = returns.annualize(returns.deannualize(rates, days), days)
+    np.testing.assert_allclose(back, rates)
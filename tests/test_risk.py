@@ -0,0 +1,95 @@
+import datetime
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from app import risk
+
+
+def _random_returns(rows: int = 3, days: int = 300, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0.0005, 0.01, (rows, days))
+
+
+def test_rolling_volatility_matches_naive_windows():
+    returns = _random_returns()
+    returns[1, :40] = np.nan  # not listed yet
+    returns[2, 100] = np.nan  # gap
+    window = 63
+
+    rolling = risk.rolling_volatility(returns, window)
+
+    for i in range(len(returns)):
+        for j in range(returns.shape[1] - window + 1):
+            chunk = returns[i, j:j + window]
+            chunk = chunk[~np.isnan(chunk)]
+            expected = np.std(chunk, ddof=1) * math.sqrt(risk.TRADING_DAYS_PER_YEAR) if len(chunk) > 1 else np.nan
+            np.testing.assert_allclose(rolling[i, j], expected, rtol=1e-9, atol=1e-12)
+
+
+def test_historical_and_parametric_var():
+    returns = _random_returns(rows=2)
+    ordinals = np.arange(returns.shape[1])
+    metrics = risk._risk_matrix(returns, ordinals, returns[0], 0.0, 0.95, 63)
+
+    for i, row in enumerate(returns):
+        quantile = np.quantile(row, 0.05)
+        assert metrics["var_historical_pct"][i] == pytest.approx(-quantile * 100)
+        assert metrics["cvar_historical_pct"][i] == pytest.approx(-row[row <= quantile].mean() * 100)
+
+        mean, std = row.mean(), row.std(ddof=1)
+        z = NormalDist().inv_cdf(0.05)
+        assert metrics["var_parametric_pct"][i] == pytest.approx(-(mean + z * std) * 100)
+        assert metrics["cvar_parametric_pct"][i] == pytest.approx(
+            -(mean - std * NormalDist().pdf(z) / 0.05) * 100
+        )
+    # CVaR is the mean loss beyond VaR, so never smaller.
+    assert (metrics["cvar_historical_pct"] >= metrics["var_historical_pct"]).all()
+
+
+def test_beta_of_a_scaled_series():
+    benchmark = _random_returns(rows=1)[0]
+    returns = np.vstack([2.0 * benchmark, benchmark])
+    returns[0, :10] = np.nan
+    np.testing.assert_allclose(risk.betas(returns, benchmark), [2.0, 1.0])
+
+
+def test_drawdown_depth_and_duration():
+    # Up 10 %, down to -20 % from the peak, then back above it.
+    returns = np.array([[0.10, -0.10, -1 / 9, 0.30]])
+    ordinals = np.array([1, 2, 5, 9])
+    max_drawdown, days = risk.drawdowns(returns, ordinals)
+    assert max_drawdown[0] == pytest.approx(-0.20)
+    assert days[0] == 4  # peak on day 1, last below it on day 5
+
+
+def test_portfolio_returns_reweight_unlisted_rows():
+    returns = np.array([[0.01, 0.02], [np.nan, 0.04]])
+    weights = np.array([1.0, 3.0])
+    np.testing.assert_allclose(risk.portfolio_returns(returns, weights), [0.01, 0.035])
+
+
+def test_compute_risk_does_not_cache_missing_benchmark(monkeypatch):
+    today = datetime.date.today()
+    dates = [today - datetime.timedelta(days=i) for i in range(100, 0, -1)]
+    prices = 100 * np.cumprod(1 + _random_returns(rows=2, days=len(dates)), axis=1)
+    state = {"benchmark": False, "calls": 0}
+
+    def eur_price_matrix(symbols, start, end):
+        state["calls"] += 1
+        matrix = prices[: len(symbols)].copy()
+        if not state["benchmark"]:
+            matrix[list(symbols).index("BENCH")] = np.nan
+        return dates, matrix
+
+    monkeypatch.setattr(risk, "eur_price_matrix", eur_price_matrix)
+    monkeypatch.setattr(risk, "covariance_matrix", lambda currencies: np.eye(len(currencies)) * 0.04)
+    monkeypatch.setattr(risk, "_cache", None)
+    positions = [{"ticker": "A", "qty": 1, "currency": "EUR"}]
+
+    assert risk.compute_risk(positions, "BENCH").tickers["A"].beta is None
+    state["benchmark"] = True
+    assert risk.compute_risk(positions, "BENCH").tickers["A"].beta is not None
+    risk.compute_risk(positions, "BENCH")
+    assert state["calls"] == 2